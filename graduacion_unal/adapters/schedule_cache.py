@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+# Versión del formato y de los algoritmos de planificación. Debe incrementarse
+# cuando cambie lo que produce un planificador: los planes guardados con otra
+# versión no se reutilizan y se borran del almacén al abrirlo.
+CACHE_VERSION = 2
+
+
+def default_cache_dir() -> str:
+    """
+    Returns:
+        Directorio del almacén en disco: la variable de entorno
+        GRADUACION_UNAL_CACHE_DIR o ~/.cache/graduacion_unal
+    """
+    return os.environ.get(
+        "GRADUACION_UNAL_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "graduacion_unal")
+    )
+
+
+class ScheduleCache:
+    """
+    Caché de planificaciones en dos niveles: un LRU en memoria y un almacén
+    SQLite en disco, que sobrevive entre sesiones de la GUI o ejecuciones.
+
+    La clave combina CACHE_VERSION, la huella del contenido del grafo
+    (GraphSnapshot.fingerprint) y los parámetros de la planificación, así que
+    abrir de nuevo el mismo archivo de cursos encuentra los planes calculados
+    antes. Los planes se guardan como JSON (semestre -> lista de IDs). El
+    almacén conserva como máximo `max_disk_entries` planes y descarta los
+    usados hace más tiempo; el directorio y la base se crean con el primer plan
+    guardado. El LRU en memoria está protegido por un candado, ya que los
+    planes pueden precalcularse en un hilo de fondo (ver
+    ScheduleService.prefetch_schedules).
+    """
+
+    def __init__(self, directory: Optional[str] = None, disk: bool = True, max_entries: int = 128,
+                 max_disk_entries: int = 5000):
+        """
+        Args:
+            directory: Carpeta del almacén en disco (None = default_cache_dir())
+            disk: Si es False, los planes solo se guardan en memoria
+            max_entries: Número de planes que se conservan en memoria
+            max_disk_entries: Número de planes que se conservan en disco
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Dict[int, List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.path: Optional[str] = None
+        self._ready = False
+        if disk:
+            self.path = os.path.join(directory or default_cache_dir(), "schedules.sqlite3")
+
+    def _execute(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        """
+        Ejecuta una sentencia en una conexión propia (confirmada y cerrada al terminar).
+
+        Returns:
+            La primera fila del resultado, si la hay
+        """
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                return conn.execute(sql, params).fetchone()
+        finally:
+            conn.close()
+
+    def _open(self, create: bool) -> bool:
+        """
+        Prepara el almacén en disco la primera vez que se usa: crea la tabla y
+        borra los planes de otra CACHE_VERSION. Solo crea el directorio y la
+        base si `create` es True.
+
+        Returns:
+            True si el almacén está disponible
+        """
+        if self.path is None:
+            return False
+        if self._ready:
+            return True
+        if not create and not os.path.exists(self.path):
+            return False
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            version = self._execute("PRAGMA user_version")[0]
+            if version != CACHE_VERSION:
+                self._execute("DROP TABLE IF EXISTS schedules")
+                self._execute(f"PRAGMA user_version = {CACHE_VERSION}")
+            self._execute("CREATE TABLE IF NOT EXISTS schedules "
+                          "(key TEXT PRIMARY KEY, plan TEXT NOT NULL, used REAL NOT NULL)")
+            self._execute("CREATE INDEX IF NOT EXISTS schedules_used ON schedules (used)")
+        except (OSError, sqlite3.Error):
+            # Sin disco disponible la caché sigue funcionando en memoria
+            self.path = None
+            return False
+        self._ready = True
+        return True
+
+    @staticmethod
+    def make_key(fingerprint: str, **params: Any) -> str:
+        """
+        Construye la clave de un plan a partir de la huella del grafo y los parámetros.
+        """
+        payload = json.dumps(params, sort_keys=True, default=list)
+        return hashlib.sha256(f"{CACHE_VERSION}|{fingerprint}|{payload}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[int, List[int]]]:
+        """
+        Returns:
+            El plan guardado con esa clave, o None si no existe
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        if not self._open(create=False):
+            return None
+        try:
+            row = self._execute("SELECT plan FROM schedules WHERE key = ?", (key,))
+            if row is not None:
+                self._execute("UPDATE schedules SET used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        # JSON guarda las claves como texto
+        plan = {int(semester): courses for semester, courses in json.loads(row[0]).items()}
+        self._remember(key, plan)
+        return plan
+
+    def put(self, key: str, plan: Dict[int, List[int]]) -> None:
+        """
+        Guarda un plan en memoria y en disco, descartando del disco los planes
+        usados hace más tiempo si se supera max_disk_entries.
+        """
+        self._remember(key, plan)
+        if not self._open(create=True):
+            return
+        try:
+            self._execute("INSERT OR REPLACE INTO schedules (key, plan, used) VALUES (?, ?, ?)",
+                          (key, json.dumps(plan), time.time()))
+            excess = self._execute("SELECT COUNT(*) FROM schedules")[0] - self.max_disk_entries
+            if excess > 0:
+                self._execute("DELETE FROM schedules WHERE key IN "
+                              "(SELECT key FROM schedules ORDER BY used LIMIT ?)", (excess,))
+        except sqlite3.Error:
+            pass
+
+    def _remember(self, key: str, plan: Dict[int, List[int]]) -> None:
+        with self._lock:
+            self._memory[key] = plan
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Elimina todos los planes guardados (memoria y disco).
+        """
+        with self._lock:
+            self._memory.clear()
+        if not self._open(create=False):
+            return
+        try:
+            self._execute("DELETE FROM schedules")
+        except sqlite3.Error:
+            pass
+
+    def __len__(self) -> int:
+        return len(self._memory)
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+import itertools
+import json
 from graduacion_unal.models.Courses import Course
 from graduacion_unal.models.courses_graph import CoursesGraph
 from graduacion_unal.adapters.courses_adapter import CoursesAdapter
@@ -12,11 +14,19 @@ class CoursesService:
     Es la única interfaz que debe usar la GUI.
     """
     
-    def __init__(self):
+    def __init__(self, use_disk_cache: bool = False):
+        """
+        Args:
+            use_disk_cache: Si es True, los planes generados se guardan también
+                en disco y se reutilizan entre sesiones
+        """
         self.graph = CoursesGraph()
         self.adapter = CoursesAdapter()
         self.current_file_path: Optional[str] = None
         self._is_modified = False
+        # Una sola instancia para conservar sus cachés entre llamadas
+        self.schedule_service = ScheduleService(use_disk_cache)
+        self.schedule_service.set_graph(self.graph)
     
     def load_graph_from_json(self, json_path: str) -> Dict[str, Any]:
         """
@@ -301,6 +311,52 @@ class CoursesService:
                 "details": str(e)
             }
     
+    def get_courses_in_order(self, limit: Optional[int] = None, order_key: Optional[str] = None,
+                             method: str = "kahn") -> Dict[str, Any]:
+        """
+        Obtiene los primeros cursos en orden de prerrequisitos, sin ordenar el
+        grafo completo cuando se pide un límite.
+        
+        Args:
+            limit: Número máximo de cursos a retornar (None para todos)
+            order_key: Criterio de desempate ("credits", "critical" o None para FIFO)
+            method: "kahn" o "dfs"
+            
+        Returns:
+            Diccionario con la lista de cursos en orden
+        """
+        if not self.graph or self.graph.number_nodes == 0:
+            return {
+                "success": False,
+                "error": "NO_GRAPH",
+                "message": "No hay grafo cargado"
+            }
+        
+        try:
+            courses_data = []
+            for course_id in itertools.islice(self.graph.iter_topological(order_key, method), limit):
+                course = self.graph.get_course(course_id)
+                courses_data.append({
+                    "id": course.id,
+                    "name": course.name,
+                    "credits": course.credits,
+                    "prereqs": course.prereqs
+                })
+            
+            return {
+                "success": True,
+                "courses": courses_data,
+                "total_count": len(courses_data)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "RETRIEVAL_ERROR",
+                "message": f"Error al ordenar los cursos: {str(e)}",
+                "details": str(e)
+            }
+    
     def add_course(self, course_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Añade un nuevo curso al grafo.
@@ -542,6 +598,47 @@ class CoursesService:
                 "details": str(e)
             }
     
+    def get_redundant_prerequisites(self) -> Dict[str, Any]:
+        """
+        Obtiene los prerrequisitos redundantes del grafo (implicados por otros).
+        
+        Returns:
+            Diccionario con la lista de aristas redundantes
+        """
+        if not self.graph or self.graph.number_nodes == 0:
+            return {
+                "success": False,
+                "error": "NO_GRAPH",
+                "message": "No hay grafo cargado"
+            }
+        
+        try:
+            redundant = self.graph.redundant_edges()
+            
+            return {
+                "success": True,
+                "redundant_edges": [
+                    {"prereq_id": prereq_id, "course_id": course_id}
+                    for prereq_id, course_id in redundant
+                ],
+                "total_count": len(redundant)
+            }
+            
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": "CYCLE_DETECTED",
+                "message": f"No se puede reducir el grafo: {str(e)}",
+                "details": str(e)
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "REDUCTION_ERROR",
+                "message": f"Error al calcular la reducción transitiva: {str(e)}",
+                "details": str(e)
+            }
+    
     def get_graph_info(self) -> Dict[str, Any]:
         """
         Obtiene información general del grafo.
@@ -600,18 +697,126 @@ class CoursesService:
         """
         return self.current_file_path 
 
-    def get_course_tree(self, max_credits_per_semester: int = 18) -> dict:
+    def get_course_tree(self, max_credits_per_semester: int = 18, credit_aware: bool = False) -> dict:
         """
         Devuelve la malla curricular organizada por niveles usando ScheduleService.
         """
-        schedule_service = ScheduleService()
-        schedule_service.set_graph(self.graph)
-        return schedule_service.get_course_tree(max_credits_per_semester) 
+        return self.schedule_service.get_course_tree(max_credits_per_semester, credit_aware)
 
     def generate_random_schedule(self, max_credits_per_semester: int = 18) -> dict:
         """
         Devuelve una malla generada aleatoriamente por semestres usando ScheduleService.
         """
-        schedule_service = ScheduleService()
-        schedule_service.set_graph(self.graph)
-        return schedule_service.generate_random_schedule(max_credits_per_semester) 
\ No newline at end of file
+        return self.schedule_service.generate_random_schedule(max_credits_per_semester)
+
+    def get_schedules_for_caps(self, caps=range(6, 41)) -> dict:
+        """
+        Devuelve la malla generada para cada tope de créditos usando ScheduleService.
+        """
+        return self.schedule_service.schedules_for_caps(caps)
+
+    def prefetch_schedules_for_caps(self, caps=range(6, 41)):
+        """
+        Precalcula en segundo plano la malla de cada tope de créditos usando ScheduleService.
+        """
+        return self.schedule_service.prefetch_schedules(caps)
+
+    def generate_schedule(self, max_credits_per_semester: int = 18, strategy: str = "random") -> dict:
+        """
+        Devuelve una malla por semestres generada con la estrategia indicada usando ScheduleService.
+        """
+        return self.schedule_service.generate_schedule(max_credits_per_semester, strategy)
+
+    def generate_best_of_schedule(self, max_credits_per_semester: int = 18, n: int = 8, seed: int = 0, workers: Optional[int] = None) -> dict:
+        """
+        Devuelve la mejor de n mallas aleatorias generadas en paralelo usando ScheduleService.
+        """
+        return self.schedule_service.best_of(max_credits_per_semester, n, seed, workers)
+
+    def generate_exact_schedule(self, max_credits_per_semester: int = 18, time_budget: float = 2.0) -> dict:
+        """
+        Devuelve una malla con el mínimo número de semestres (o la mejor encontrada en el tiempo dado) usando ScheduleService.
+        """
+        return self.schedule_service.generate_exact_schedule(max_credits_per_semester, time_budget)
+
+    def plan_remaining(self, completed: List[int], in_progress: Optional[List[int]] = None,
+                       max_credits_per_semester: int = 18) -> dict:
+        """
+        Devuelve la malla de los cursos que le faltan a un estudiante usando ScheduleService.
+        """
+        return self.schedule_service.plan_remaining(completed, in_progress, max_credits_per_semester)
+
+    def plan_students_from_json(self, users_path: str, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Planifica los cursos restantes de todos los estudiantes de un archivo
+        (formato de users.json) usando ScheduleService. Los resultados se
+        entregan a medida que se calculan.
+        
+        Args:
+            users_path: Ruta al archivo JSON de estudiantes
+            workers: Número de procesos (None = número de CPUs, 1 = sin procesos)
+            
+        Yields:
+            Un diccionario por estudiante con su planificación restante o el error
+        """
+        try:
+            with open(users_path, 'r', encoding='utf-8') as f:
+                students = json.load(f)
+        except FileNotFoundError as e:
+            yield {
+                "success": False,
+                "error": "FILE_NOT_FOUND",
+                "message": f"No se encontró el archivo: {users_path}",
+                "details": str(e)
+            }
+            return
+        except json.JSONDecodeError as e:
+            yield {
+                "success": False,
+                "error": "LOAD_ERROR",
+                "message": f"Error al parsear JSON: {str(e)}",
+                "details": str(e)
+            }
+            return
+        yield from self.schedule_service.plan_students(students, workers)
+
+    def iter_removal_impact(self, max_credits_per_semester: int = 18,
+                            workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Entrega, a medida que se calcula, el efecto de eliminar cada curso sobre
+        la duración del plan usando ScheduleService.
+        """
+        yield from self.schedule_service.iter_removal_impact(max_credits_per_semester, workers)
+
+    def get_removal_impact_report(self, max_credits_per_semester: int = 18, workers: Optional[int] = None,
+                                  limit: Optional[int] = None) -> dict:
+        """
+        Obtiene el ranking de cursos cuya eliminación más acortaría el plan usando ScheduleService.
+        """
+        return self.schedule_service.removal_impact_report(max_credits_per_semester, workers, limit)
+
+    def bottleneck_report(self, limit: Optional[int] = None) -> dict:
+        """
+        Obtiene el ranking de cursos cuello de botella (dependientes, créditos
+        de camino crítico y cadenas de prerrequisitos que pasan por ellos)
+        usando ScheduleService.
+        """
+        return self.schedule_service.bottleneck_report(limit)
+
+    def repair_schedule(self, schedule: Dict[int, List[int]], max_credits_per_semester: int = 18) -> dict:
+        """
+        Devuelve una versión válida de la malla moviendo la menor cantidad de cursos usando ScheduleService.
+        """
+        return self.schedule_service.repair_schedule(schedule, max_credits_per_semester)
+
+    def iter_alternative_schedules(self, max_credits_per_semester: int = 18, limit: Optional[int] = 5) -> Iterator[Dict[str, Any]]:
+        """
+        Genera mallas alternativas con el mismo número de semestres usando ScheduleService.
+        """
+        return self.schedule_service.iter_alternatives(max_credits_per_semester, limit)
+
+    def get_semester_windows(self, max_credits_per_semester: int = 18, target_semesters: Optional[int] = None) -> dict:
+        """
+        Devuelve el semestre más temprano, el más tardío y la holgura de cada curso usando ScheduleService.
+        """
+        return self.schedule_service.get_semester_windows(max_credits_per_semester, target_semesters) 
\ No newline at end of file
@@ -1,7 +1,14 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Callable
 from graduacion_unal.models.courses_schedule import Schedule
 from graduacion_unal.models.courses_graph import CoursesGraph
+from graduacion_unal.models.semester_bounds import SemesterBounds
+from graduacion_unal.models.schedule_editor import ScheduleEditor
+from graduacion_unal.adapters.schedule_cache import ScheduleCache
+from graduacion_unal.api import schedule_workers
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 import os
+import threading
 import time
 
 ### PARA LA PROXIMA ENTREGA
@@ -12,9 +19,40 @@ class ScheduleService:
     Servicio de API para manejar la lógica de planificación semestral.
     """
     
-    def __init__(self):
+    # Estrategias de planificación: nombre -> método de Schedule
+    STRATEGIES = {
+        "random": "random_schedule",
+        "components": "component_schedule",
+        "randomized": "randomized_schedule",
+        "earliest_fit": "earliest_fit_schedule",
+        "balanced": "balanced_schedule",
+        "beam": "beam_schedule",
+    }
+    
+    # Estrategias con resultado aleatorio (no se guardan en la caché persistente)
+    RANDOMIZED_STRATEGIES = {"randomized"}
+    
+    def __init__(self, use_disk_cache: bool = False):
+        """
+        Args:
+            use_disk_cache: Si es True, los planes también se guardan en disco
+                (ver ScheduleCache) y sobreviven entre sesiones
+        """
         self.schedule = Schedule()
         self.graph= None
+        # Planes por (huella del grafo, parámetros), en memoria y en disco
+        self.cache = ScheduleCache(disk=use_disk_cache)
+        # Resultados por (versión del grafo, parámetros); una versión nueva los invalida
+        self._windows_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._schedule_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._tree_cache: Dict[Tuple, Dict[str, Any]] = {}
+        self._bottleneck_cache: Dict[Tuple, Dict[str, Any]] = {}
+        # Plan en edición (ver start_editing / move_course)
+        self.editor: Optional[ScheduleEditor] = None
+        # Hilo que precalcula planes de otros topes (ver prefetch_schedules)
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_version: Optional[int] = None
+        self._prefetch_stop = threading.Event()
     
     def set_graph(self, graph: CoursesGraph) -> None:
         """
@@ -25,15 +63,19 @@ class ScheduleService:
         """
         self.graph = graph
     
-    def get_course_tree(self, max_credits_per_semester: int = 18) -> Dict[str, Any]:
+    def get_course_tree(self, max_credits_per_semester: int = 18, credit_aware: bool = False) -> Dict[str, Any]:
         """
         Obtiene el árbol de cursos disponibles organizados por niveles.
+        El resultado se guarda en caché mientras el grafo no cambie.
         
         Args:
             max_credits_per_semester: Límite de créditos por semestre
+            credit_aware: Si es True, el nivel de cada curso considera también
+                el tope de créditos (primer semestre en que puede cursarse)
             
         Returns:
-            Diccionario con información del árbol de cursos
+            Diccionario con información del árbol de cursos y los cursos
+            bloqueados por ciclos
         """
         if not self.graph:
             return {
@@ -42,8 +84,13 @@ class ScheduleService:
                 "message": "El grafo no ha sido cargado"
             }
         
+        # Sin credit_aware el tope no cambia el árbol
+        key = (self.graph.version, "tree", max_credits_per_semester if credit_aware else None)
+        if key in self._tree_cache:
+            return self._tree_cache[key]
+        
         try:
-            course_tree = self.schedule.tree_of_availible_courses(max_credits_per_semester, self.graph)
+            course_tree = self.schedule.tree_of_availible_courses(max_credits_per_semester, self.graph, credit_aware)
             
             # Convertir a formato más legible
             tree_info = {}
@@ -71,13 +118,18 @@ class ScheduleService:
                 }
                 total_courses += len(courses_info)
             
-            return {
+            result = {
                 "success": True,
                 "course_tree": tree_info,
                 "total_levels": len(course_tree),
                 "total_courses": total_courses,
-                "max_credits_per_semester": max_credits_per_semester
+                "blocked_courses": self.schedule.blocked_courses(self.graph),
+                "max_credits_per_semester": max_credits_per_semester,
+                "credit_aware": credit_aware
             }
+            self._tree_cache = {k: v for k, v in self._tree_cache.items() if k[0] == self.graph.version}
+            self._tree_cache[key] = result
+            return result
             
         except Exception as e:
             return {
@@ -87,6 +139,137 @@ class ScheduleService:
                 "details": str(e)
             }
     
+    def get_semester_windows(self, max_credits_per_semester: int = 18, target_semesters: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Calcula para cada curso su semestre más temprano (ASAP), su semestre más
+        tardío (ALAP) para un plan de `target_semesters` semestres y su holgura.
+        El resultado se guarda en caché mientras el grafo no cambie.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            target_semesters: Duración objetivo del plan (por defecto, la mínima
+                compatible con prerrequisitos y créditos)
+            
+        Returns:
+            Diccionario con las ventanas de cada curso y los cursos críticos
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        key = (self.graph.version, max_credits_per_semester, target_semesters)
+        if key in self._windows_cache:
+            return self._windows_cache[key]
+        
+        try:
+            snapshot = self.graph.snapshot()
+            windows = SemesterBounds.of(snapshot).windows(max_credits_per_semester, target_semesters)
+            
+            # Críticos: los cursos con la menor holgura (0 si el plan objetivo es ajustado)
+            min_slack = min(windows["slack"], default=0)
+            courses_info = {}
+            critical_courses = []
+            for u, course_id in enumerate(snapshot.ids):
+                courses_info[course_id] = {
+                    "earliest": windows["earliest"][u],
+                    "latest": windows["latest"][u],
+                    "slack": windows["slack"][u]
+                }
+                if windows["slack"][u] == min_slack:
+                    critical_courses.append(course_id)
+            
+            result = {
+                "success": True,
+                "courses": courses_info,
+                "critical_courses": critical_courses,
+                "min_slack": min_slack,
+                "target_semesters": windows["target"],
+                "max_credits_per_semester": max_credits_per_semester
+            }
+            self._windows_cache = {k: v for k, v in self._windows_cache.items() if k[0] == self.graph.version}
+            self._windows_cache[key] = result
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "WINDOWS_ERROR",
+                "message": f"Error al calcular las ventanas de semestre: {str(e)}",
+                "details": str(e)
+            }
+    
+    def bottleneck_report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ranking de cursos cuello de botella: los que más retrasan el plan si se
+        reprueban. Se ordena por número de dependientes transitivos, luego por
+        créditos de camino crítico (la prioridad de random_schedule) y luego
+        por la fracción de cadenas de prerrequisitos maximales que pasan por el
+        curso.
+        
+        Todas las métricas salen de recorridos en orden topológico (bitsets de
+        descendientes y conteos de cadenas), así que el costo es casi lineal.
+        El ranking completo se guarda en caché mientras el grafo no cambie.
+        
+        Args:
+            limit: Número máximo de cursos en el ranking (None = todos)
+            
+        Returns:
+            Diccionario con el ranking o el error
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        key = (self.graph.version,)
+        result = self._bottleneck_cache.get(key)
+        if result is None:
+            try:
+                snapshot = self.graph.snapshot()
+                bounds = SemesterBounds.of(snapshot)
+                dependents = bounds.dependent_counts()
+                dependent_credits = bounds.descendant_credits()
+                critical = self.graph.snapshot().critical_credits()
+                into, out = snapshot.chain_counts()
+                total_chains = sum(out[u] for u in range(len(snapshot)) if not snapshot.pred[u])
+                
+                ranking = [{
+                    "course_id": course_id,
+                    "dependents": dependents[u],
+                    "dependent_credits": dependent_credits[u],
+                    "critical_credits": critical[u],
+                    "chain_share": into[u] * out[u] / total_chains
+                } for u, course_id in enumerate(snapshot.ids)]
+                ranking.sort(key=lambda item: (-item["dependents"], -item["critical_credits"],
+                                               -item["chain_share"], item["course_id"]))
+                for rank, item in enumerate(ranking, start=1):
+                    item["rank"] = rank
+                
+                result = {
+                    "success": True,
+                    "ranking": ranking,
+                    "total_courses": len(ranking),
+                    "total_chains": total_chains
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": "BOTTLENECK_ERROR",
+                    "message": f"Error al calcular los cuellos de botella: {str(e)}",
+                    "details": str(e)
+                }
+            self._bottleneck_cache = {k: v for k, v in self._bottleneck_cache.items() if k[0] == self.graph.version}
+            self._bottleneck_cache[key] = result
+        
+        if limit is None:
+            return result
+        return {**result, "ranking": result["ranking"][:limit]}
+    
     def validate_schedule(self, schedule: Dict[int, List[int]], max_credits_per_semester: int = 18) -> Dict[str, Any]:
         """
         Valida una planificación de semestres.
@@ -125,6 +308,99 @@ class ScheduleService:
                 "details": str(e)
             }
     
+    def start_editing(self, schedule: Dict[int, List[int]], max_credits_per_semester: int = 18) -> Dict[str, Any]:
+        """
+        Abre una planificación para editarla curso a curso con validación incremental.
+        
+        Args:
+            schedule: Diccionario con la planificación de semestres (debe incluir
+                todos los cursos del grafo)
+            max_credits_per_semester: Límite de créditos por semestre
+            
+        Returns:
+            Diccionario con la validez inicial del plan
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            self.editor = ScheduleEditor(self.graph.snapshot(), max_credits_per_semester, schedule)
+            return {
+                "success": True,
+                "valid": self.editor.is_valid(),
+                "violated_prerequisites": self.editor.state.violations,
+                "excess_credits": self.editor.state.overload
+            }
+            
+        except Exception as e:
+            self.editor = None
+            return {
+                "success": False,
+                "error": "EDITOR_ERROR",
+                "message": f"Error al abrir la planificación para edición: {str(e)}",
+                "details": str(e)
+            }
+    
+    def move_course(self, course_id: int, semester: int) -> Dict[str, Any]:
+        """
+        Mueve un curso del plan en edición a otro semestre. Solo se revisan las
+        aristas del curso y los dos semestres afectados.
+        
+        Args:
+            course_id: ID del curso a mover
+            semester: Semestre destino
+            
+        Returns:
+            Diccionario con la validez del plan y las violaciones nuevas y resueltas
+        """
+        if self.editor is None:
+            return {
+                "success": False,
+                "error": "NO_SCHEDULE_IN_EDITION",
+                "message": "No hay una planificación en edición"
+            }
+        
+        if not self.graph or self.editor.snapshot.version != self.graph.version:
+            return {
+                "success": False,
+                "error": "STALE_SCHEDULE",
+                "message": "El grafo cambió desde que se abrió la planificación"
+            }
+        
+        try:
+            result = self.editor.move(course_id, semester)
+            result["success"] = True
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "MOVE_ERROR",
+                "message": f"Error al mover el curso: {str(e)}",
+                "details": str(e)
+            }
+    
+    def get_edited_schedule(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Diccionario con la planificación en edición y su validez
+        """
+        if self.editor is None:
+            return {
+                "success": False,
+                "error": "NO_SCHEDULE_IN_EDITION",
+                "message": "No hay una planificación en edición"
+            }
+        return {
+            "success": True,
+            "schedule": self.editor.to_schedule(),
+            "valid": self.editor.is_valid()
+        }
+    
     def generate_random_schedule(self, max_credits_per_semester: int = 18) -> Dict[str, Any]:
         """
         Genera una planificación aleatoria de semestres.
@@ -146,49 +422,20 @@ class ScheduleService:
                 "message": "El grafo no ha sido cargado"
             }
         
+        key = (self.graph.version, max_credits_per_semester)
+        if key in self._schedule_cache:
+            return self._schedule_cache[key]
+        
         try:
-            schedule = self.schedule.random_schedule(max_credits_per_semester, self.graph)
-            
-            # Validar la planificación generada
-            validation_result = self.schedule.is_valid_schedule(schedule, self.graph, max_credits_per_semester)
-            
-            # Convertir a formato más detallado
-            schedule_details = {}
-            total_credits = 0
-            
-            for semester, courses in schedule.items():
-                semester_info = []
-                semester_credits = 0
-                
-                for course_id in courses:
-                    course = self.graph.get_course(course_id)
-                    if course:
-                        semester_info.append({
-                            "id": course.id,
-                            "name": course.name,
-                            "credits": course.credits,
-                            "prereqs": course.prereqs
-                        })
-                        semester_credits += course.credits
-                
-                schedule_details[semester] = {
-                    "courses": semester_info,
-                    "total_courses": len(semester_info),
-                    "total_credits": semester_credits
-                }
-                total_credits += semester_credits
+            schedule = self._cached_plan(lambda: self.schedule.random_schedule(max_credits_per_semester, self.graph),
+                                         strategy="random", max_credits=max_credits_per_semester)
             # end = time.time()
             # elapsed = end - start
             # print(f"Tiempo de ejecución: {elapsed:.6f} segundos")
-            return {
-                "success": True,
-                "schedule": schedule_details,
-                "total_semesters": len(schedule),
-                "total_courses": sum(len(courses) for courses in schedule.values()),
-                "total_credits": total_credits,
-                "valid": validation_result["valid"],
-                "errors": validation_result["errors"]
-            }
+            result = self._build_schedule_result(schedule, max_credits_per_semester)
+            self._schedule_cache = {k: v for k, v in self._schedule_cache.items() if k[0] == self.graph.version}
+            self._schedule_cache[key] = result
+            return result
             
         except Exception as e:
             # end = time.time()
@@ -201,6 +448,743 @@ class ScheduleService:
                 "details": str(e)
             }
     
+    def schedules_for_caps(self, caps: Iterable[int] = range(6, 41)) -> Dict[str, Any]:
+        """
+        Calcula la planificación de random_schedule para cada tope de créditos
+        de `caps` (por defecto el rango del selector de la GUI, 6 a 40).
+        
+        El preprocesamiento que no depende del tope (vista del grafo, orden
+        topológico y prioridades de camino crítico) se hace una sola vez; por
+        cada tope solo queda una pasada de planificación por lista. Los
+        resultados quedan en la caché de generate_random_schedule mientras el
+        grafo no cambie, así que cambiar el tope después es inmediato.
+        
+        Args:
+            caps: Topes de créditos por semestre
+            
+        Returns:
+            Diccionario con la planificación (formato de generate_random_schedule)
+            de cada tope
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            # Preprocesamiento compartido (en caché por versión del grafo)
+            snapshot = self.graph.snapshot()
+            snapshot.require_acyclic()
+            self.graph.snapshot().critical_credits()
+            SemesterBounds.of(snapshot)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "RANDOM_SCHEDULE_ERROR",
+                "message": f"Error al generar planificación aleatoria: {str(e)}",
+                "details": str(e)
+            }
+        
+        schedules = {cap: self.generate_random_schedule(cap) for cap in caps}
+        return {
+            "success": True,
+            "schedules": schedules,
+            "max_credits": list(schedules)
+        }
+    
+    def prefetch_schedules(self, caps: Iterable[int] = range(6, 41)) -> Optional[threading.Thread]:
+        """
+        Precalcula en un hilo de fondo la planificación de random_schedule de
+        cada tope de `caps` que aún no esté en caché, para que cambiar el tope
+        en la GUI sea inmediato sin bloquear a quien llama.
+        
+        La vista del grafo, sus prioridades de camino crítico y su huella se
+        obtienen en el hilo que llama; el hilo de fondo solo lee esa vista
+        inmutable (nunca el CoursesGraph, que la GUI puede seguir editando) y
+        guarda cada plan en la caché de planes bajo la huella de la vista. Un
+        grafo modificado tiene otra huella, así que esos planes nunca se sirven
+        para él. generate_random_schedule los encuentra en la caché y solo le
+        queda validar y formatear el plan. Si hay un precálculo en curso para
+        la misma versión del grafo no se inicia otro; si es de otra versión, se
+        le pide detenerse.
+        
+        Args:
+            caps: Topes de créditos por semestre
+            
+        Returns:
+            El hilo (daemon) que hace el precálculo, o None si no hay grafo
+            cargado o tiene ciclos
+        """
+        if not self.graph:
+            return None
+        snapshot = self.graph.snapshot()
+        if not snapshot.acyclic:
+            return None
+        
+        running = self._prefetch_thread
+        if running is not None and running.is_alive():
+            if self._prefetch_version == snapshot.version:
+                return running
+            self._prefetch_stop.set()
+        
+        critical = snapshot.critical_credits()
+        fingerprint = snapshot.fingerprint()
+        pending = list(caps)
+        stop = threading.Event()
+        
+        def run() -> None:
+            for cap in pending:
+                if stop.is_set():
+                    return
+                key = ScheduleCache.make_key(fingerprint, strategy="random", max_credits=cap)
+                if self.cache.get(key) is not None:
+                    continue
+                try:
+                    self.schedule._check_course_credits(snapshot, cap)
+                except ValueError:
+                    continue
+                plan = self.schedule._list_schedule(snapshot, cap, critical)
+                self.cache.put(key, {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)})
+        
+        thread = threading.Thread(target=run, name="schedule-prefetch", daemon=True)
+        self._prefetch_thread = thread
+        self._prefetch_version = snapshot.version
+        self._prefetch_stop = stop
+        thread.start()
+        return thread
+    
+    def generate_schedule(self, max_credits_per_semester: int = 18, strategy: str = "random") -> Dict[str, Any]:
+        """
+        Genera una planificación de semestres con la estrategia indicada.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            strategy: Nombre de la estrategia (ver ScheduleService.STRATEGIES)
+            
+        Returns:
+            Diccionario con la planificación generada
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        if strategy not in self.STRATEGIES:
+            return {
+                "success": False,
+                "error": "UNKNOWN_STRATEGY",
+                "message": f"Estrategia de planificación desconocida: {strategy}"
+            }
+        
+        try:
+            planner = getattr(self.schedule, self.STRATEGIES[strategy])
+            if strategy in self.RANDOMIZED_STRATEGIES:
+                schedule = planner(max_credits_per_semester, self.graph)
+            else:
+                schedule = self._cached_plan(lambda: planner(max_credits_per_semester, self.graph),
+                                             strategy=strategy, max_credits=max_credits_per_semester)
+            result = self._build_schedule_result(schedule, max_credits_per_semester)
+            result["strategy"] = strategy
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "SCHEDULE_ERROR",
+                "message": f"Error al generar planificación ({strategy}): {str(e)}",
+                "details": str(e)
+            }
+    
+    def best_of(self, max_credits_per_semester: int = 18, n: int = 8, seed: int = 0,
+                workers: Optional[int] = None, noise: float = 0.1) -> Dict[str, Any]:
+        """
+        Ejecuta n corridas de la planificación aleatoria (semillas seed .. seed+n-1)
+        repartidas en un ProcessPoolExecutor y retorna el plan con menos semestres.
+        La vista compacta del grafo se envía una sola vez a cada proceso. El plan
+        determinista de random_schedule también compite, así que el resultado
+        nunca es peor que el de generate_random_schedule.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            n: Número de corridas aleatorias
+            seed: Semilla de la primera corrida
+            workers: Número de procesos (None = número de CPUs, 1 = sin procesos)
+            noise: Amplitud relativa del ruido sobre la prioridad
+            
+        Returns:
+            Diccionario con la mejor planificación encontrada
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            snapshot = self.graph.snapshot()
+            snapshot.require_acyclic()
+            self.schedule._check_course_credits(snapshot, max_credits_per_semester)
+            critical = self.graph.snapshot().critical_credits()
+            seeds = list(range(seed, seed + n))
+            
+            if workers == 1 or n <= 1:
+                schedule_workers.init_worker(snapshot, critical)
+                runs = [schedule_workers.randomized_plan(max_credits_per_semester, noise, s) for s in seeds]
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=schedule_workers.init_worker,
+                                         initargs=(snapshot, critical)) as pool:
+                    task = partial(schedule_workers.randomized_plan, max_credits_per_semester, noise)
+                    runs = list(pool.map(task, seeds, chunksize=max(1, n // (4 * (workers or os.cpu_count() or 1)))))
+            
+            baseline = self.schedule._list_schedule(snapshot, max_credits_per_semester, critical)
+            best_seed, best_plan = None, baseline
+            for run_seed, plan in runs:
+                if len(plan) < len(best_plan):
+                    best_seed, best_plan = run_seed, plan
+            
+            schedule = {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(best_plan)}
+            result = self._build_schedule_result(schedule, max_credits_per_semester)
+            result["runs"] = n
+            result["best_seed"] = best_seed
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "BEST_OF_ERROR",
+                "message": f"Error al generar planificaciones aleatorias: {str(e)}",
+                "details": str(e)
+            }
+    
+    def generate_beam_schedule(self, max_credits_per_semester: int = 18, width: int = 4, branching: int = 3,
+                               workers: Optional[int] = 1) -> Dict[str, Any]:
+        """
+        Genera una planificación con búsqueda en haz (ver Schedule.beam_schedule).
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            width: Planes parciales que se conservan por semestre
+            branching: Semestres candidatos por plan parcial
+            workers: Número de procesos para expandir el haz (None = número de
+                CPUs, 1 = sin procesos). Solo conviene con haces anchos.
+            
+        Returns:
+            Diccionario con la planificación generada
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            if workers == 1:
+                schedule = self.schedule.beam_schedule(max_credits_per_semester, self.graph, width, branching)
+            else:
+                snapshot = self.graph.snapshot()
+                critical = self.graph.snapshot().critical_credits()
+                with ProcessPoolExecutor(max_workers=workers, initializer=schedule_workers.init_worker,
+                                         initargs=(snapshot, critical)) as pool:
+                    task = partial(schedule_workers.beam_expand, max_credits_per_semester, branching)
+                    schedule = self.schedule.beam_schedule(max_credits_per_semester, self.graph, width, branching,
+                                                           expand_many=lambda states: list(pool.map(task, states)))
+            result = self._build_schedule_result(schedule, max_credits_per_semester)
+            result["strategy"] = "beam"
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "BEAM_SCHEDULE_ERROR",
+                "message": f"Error al generar planificación con búsqueda en haz: {str(e)}",
+                "details": str(e)
+            }
+    
+    def improve_schedule(self, schedule: Dict[int, List[int]], max_credits_per_semester: int = 18,
+                         iterations: int = 20000, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Mejora una planificación existente con búsqueda local (recocido simulado).
+        
+        Args:
+            schedule: Diccionario con la planificación de semestres a mejorar
+            max_credits_per_semester: Límite de créditos por semestre
+            iterations: Número de movimientos a intentar
+            seed: Semilla del generador aleatorio
+            
+        Returns:
+            Diccionario con la planificación mejorada
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            improved = self.schedule.improve_schedule(schedule, max_credits_per_semester, self.graph, iterations, seed)
+            result = self._build_schedule_result(improved, max_credits_per_semester)
+            result["initial_semesters"] = len(schedule)
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "IMPROVE_ERROR",
+                "message": f"Error al mejorar la planificación: {str(e)}",
+                "details": str(e)
+            }
+    
+    def plan_remaining(self, completed: List[int], in_progress: Optional[List[int]] = None,
+                       max_credits_per_semester: int = 18) -> Dict[str, Any]:
+        """
+        Planifica los cursos que le faltan a un estudiante a partir del semestre
+        siguiente, dando por aprobados los completados y los que está cursando.
+        
+        Args:
+            completed: IDs de los cursos completados
+            in_progress: IDs de los cursos que se están cursando
+            max_credits_per_semester: Límite de créditos por semestre
+            
+        Returns:
+            Diccionario con la planificación de los cursos restantes
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            in_progress = list(in_progress or [])
+            schedule = self._cached_plan(
+                lambda: self.schedule.remaining_schedule(max_credits_per_semester, self.graph, completed, in_progress),
+                strategy="remaining", max_credits=max_credits_per_semester,
+                completed=sorted(set(completed) | set(in_progress)))
+            result = self._build_schedule_result(schedule, max_credits_per_semester, list(completed) + in_progress)
+            result["completed_courses"] = list(completed)
+            result["in_progress_courses"] = in_progress
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "REMAINING_SCHEDULE_ERROR",
+                "message": f"Error al planificar los cursos restantes: {str(e)}",
+                "details": str(e)
+            }
+    
+    def plan_students(self, students: List[Dict[str, Any]], workers: Optional[int] = None,
+                      default_max_credits: int = 18) -> Iterator[Dict[str, Any]]:
+        """
+        Planifica los cursos restantes de muchos estudiantes (formato de users.json)
+        sobre la misma malla y entrega los resultados a medida que terminan.
+        
+        La vista del grafo y las prioridades de camino crítico se calculan una
+        sola vez y se envían una vez a cada proceso. Los estudiantes con los
+        mismos cursos aprobados (completados + en curso) y el mismo tope de
+        créditos comparten un único cálculo.
+        
+        Args:
+            students: Registros con "completed_courses", "current_courses" y
+                "max_credits_per_semester"
+            workers: Número de procesos (None = número de CPUs, 1 = sin procesos)
+            default_max_credits: Tope de créditos si el registro no lo trae
+            
+        Yields:
+            Un diccionario por estudiante con su planificación restante o el error
+        """
+        if not self.graph:
+            yield {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+            return
+        
+        try:
+            snapshot = self.graph.snapshot()
+            snapshot.require_acyclic()
+            critical = self.graph.snapshot().critical_credits()
+        except Exception as e:
+            yield {
+                "success": False,
+                "error": "BATCH_SCHEDULE_ERROR",
+                "message": f"Error al preparar la planificación por lotes: {str(e)}",
+                "details": str(e)
+            }
+            return
+        
+        # Agrupar por (cursos aprobados, tope de créditos)
+        groups: Dict[Tuple[Tuple[int, ...], int], List[Dict[str, Any]]] = {}
+        for student in students:
+            passed = set(student.get("completed_courses", [])) | set(student.get("current_courses", []))
+            missing = sorted(course_id for course_id in passed if course_id not in snapshot.index)
+            if missing:
+                yield self._student_result(student, {
+                    "success": False,
+                    "error": "COURSE_NOT_FOUND",
+                    "message": f"Cursos no encontrados en el grafo: {missing}"
+                })
+                continue
+            cap = student.get("max_credits_per_semester", default_max_credits)
+            done = tuple(sorted(snapshot.index[course_id] for course_id in passed))
+            groups.setdefault((done, cap), []).append(student)
+        
+        if workers == 1 or len(groups) <= 1:
+            schedule_workers.init_worker(snapshot, critical)
+            for (done, cap), members in groups.items():
+                try:
+                    plan = schedule_workers.remaining_plan(cap, done)
+                except Exception as e:
+                    plan = e
+                yield from self._group_results(snapshot, members, cap, done, plan)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=schedule_workers.init_worker,
+                                 initargs=(snapshot, critical)) as pool:
+            futures = {pool.submit(schedule_workers.remaining_plan, cap, done): (cap, done, members)
+                       for (done, cap), members in groups.items()}
+            for future in as_completed(futures):
+                cap, done, members = futures[future]
+                error = future.exception()
+                plan = error if error is not None else future.result()
+                yield from self._group_results(snapshot, members, cap, done, plan)
+    
+    def _group_results(self, snapshot, members: List[Dict[str, Any]], max_credits_per_semester: int,
+                       done: Tuple[int, ...], plan: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Convierte el plan (o la excepción) de un grupo en un resultado por
+        estudiante, con el formato de plan_remaining (validación, cota inferior
+        y brecha incluidas). Un error al planificar o al armar el resultado de
+        un grupo solo afecta a los estudiantes de ese grupo.
+        """
+        try:
+            if isinstance(plan, Exception):
+                raise plan
+            schedule = {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)}
+            outcome = self._build_schedule_result(schedule, max_credits_per_semester,
+                                                  [snapshot.ids[u] for u in done])
+            outcome["max_credits_per_semester"] = max_credits_per_semester
+            outcome["group_size"] = len(members)
+        except Exception as e:
+            outcome = {
+                "success": False,
+                "error": "REMAINING_SCHEDULE_ERROR",
+                "message": f"Error al planificar los cursos restantes: {str(e)}",
+                "details": str(e)
+            }
+        for student in members:
+            yield self._student_result(student, outcome)
+    
+    def _student_result(self, student: Dict[str, Any], outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Agrega los datos de identificación del estudiante a un resultado.
+        """
+        result = {
+            "user_id": student.get("id"),
+            "student_id": student.get("student_id"),
+            "name": student.get("name")
+        }
+        result.update(outcome)
+        return result
+    
+    def iter_removal_impact(self, max_credits_per_semester: int = 18, workers: Optional[int] = None,
+                            chunk_size: int = 64) -> Iterator[Dict[str, Any]]:
+        """
+        Calcula, para cada curso, cuánto cambian la cota inferior de semestres
+        (la de los planes generados) y el plan de random_schedule si el curso se
+        elimina (o se vuelve opcional), y entrega los resultados a medida que
+        terminan.
+        
+        Los cursos se reparten en bloques entre procesos; la vista del grafo y
+        las prioridades de camino crítico se envían una vez a cada proceso. Los
+        cursos con la cadena más larga a través de ellos se analizan primero,
+        porque son los que más probablemente acortan el plan.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            workers: Número de procesos (None = número de CPUs, 1 = sin procesos)
+            chunk_size: Cursos por tarea enviada a un proceso
+            
+        Yields:
+            Un diccionario por curso con la cota y los semestres sin él, o un
+            único diccionario de error
+        """
+        if not self.graph:
+            yield {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+            return
+        
+        try:
+            snapshot = self.graph.snapshot()
+            snapshot.require_acyclic()
+            Schedule()._check_course_credits(snapshot, max_credits_per_semester)
+            critical = self.graph.snapshot().critical_credits()
+            bounds = SemesterBounds.of(snapshot)
+        except Exception as e:
+            yield {
+                "success": False,
+                "error": "REMOVAL_IMPACT_ERROR",
+                "message": f"Error al preparar el análisis de eliminación: {str(e)}",
+                "details": str(e)
+            }
+            return
+        
+        courses = sorted(range(len(snapshot)), key=lambda u: (-(bounds.depth[u] + bounds.height[u]), snapshot.ids[u]))
+        chunks = [courses[i:i + chunk_size] for i in range(0, len(courses), chunk_size)]
+        
+        if workers == 1 or len(chunks) <= 1:
+            schedule_workers.init_worker(snapshot, critical)
+            for chunk in chunks:
+                for impact in schedule_workers.removal_impact(max_credits_per_semester, chunk):
+                    yield {"success": True, **impact}
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=schedule_workers.init_worker,
+                                 initargs=(snapshot, critical)) as pool:
+            futures = [pool.submit(schedule_workers.removal_impact, max_credits_per_semester, chunk)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                for impact in future.result():
+                    yield {"success": True, **impact}
+    
+    def removal_impact_report(self, max_credits_per_semester: int = 18, workers: Optional[int] = None,
+                              limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Ranking de cursos según cuánto se acortaría el plan al eliminarlos:
+        primero por semestres ahorrados en el plan de random_schedule, luego
+        por reducción de la cota inferior.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            workers: Número de procesos (None = número de CPUs, 1 = sin procesos)
+            limit: Número máximo de cursos en el ranking (None = todos)
+            
+        Returns:
+            Diccionario con el ranking o el error
+        """
+        impacts = []
+        for impact in self.iter_removal_impact(max_credits_per_semester, workers):
+            if not impact["success"]:
+                return impact
+            impacts.append(impact)
+        
+        impacts.sort(key=lambda item: (-item["semesters_saved"], -item["lower_bound_saved"], item["course_id"]))
+        ranking = impacts if limit is None else impacts[:limit]
+        for rank, impact in enumerate(ranking, start=1):
+            del impact["success"]
+            impact["rank"] = rank
+        return {
+            "success": True,
+            "ranking": ranking,
+            "total_courses": len(impacts),
+            "impactful_courses": sum(1 for item in impacts
+                                     if item["semesters_saved"] > 0 or item["lower_bound_saved"] > 0),
+            "max_credits_per_semester": max_credits_per_semester
+        }
+    
+    def repair_schedule(self, schedule: Dict[int, List[int]], max_credits_per_semester: int = 18) -> Dict[str, Any]:
+        """
+        Repara una planificación inválida moviendo la menor cantidad posible de
+        cursos (ver Schedule.repair_schedule).
+        
+        Args:
+            schedule: Diccionario con la planificación de semestres a reparar
+            max_credits_per_semester: Límite de créditos por semestre
+            
+        Returns:
+            Diccionario con la planificación reparada y los cursos movidos,
+            agregados y descartados
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            initial = self.schedule.is_valid_schedule(schedule, self.graph, max_credits_per_semester)
+            repair = self.schedule.repair_schedule(schedule, max_credits_per_semester, self.graph)
+            result = self._build_schedule_result(repair["schedule"], max_credits_per_semester)
+            result["initial_errors"] = initial["errors"]
+            result["initial_semesters"] = len(schedule)
+            result["moved_courses"] = repair["moved"]
+            result["added_courses"] = repair["added"]
+            result["removed_courses"] = repair["removed"]
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "REPAIR_ERROR",
+                "message": f"Error al reparar la planificación: {str(e)}",
+                "details": str(e)
+            }
+    
+    def _cached_plan(self, compute: Callable[[], Dict[int, List[int]]], **params: Any) -> Dict[int, List[int]]:
+        """
+        Obtiene un plan de la caché (clave: huella del grafo + parámetros) o lo
+        calcula con `compute` y lo guarda.
+        """
+        key = ScheduleCache.make_key(self.graph.snapshot().fingerprint(), **params)
+        plan = self.cache.get(key)
+        if plan is None:
+            plan = compute()
+            self.cache.put(key, plan)
+        return plan
+    
+    def _build_schedule_result(self, schedule: Dict[int, List[int]], max_credits_per_semester: int,
+                               completed: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Valida una planificación generada y la convierte al formato detallado de la API.
+        
+        Args:
+            schedule: Diccionario semestre -> lista de IDs de curso
+            max_credits_per_semester: Límite de créditos por semestre
+            completed: IDs de cursos aprobados antes del plan (planes parciales)
+            
+        Returns:
+            Diccionario con la planificación detallada, su validación, una cota
+            inferior del número de semestres y la brecha respecto a ella
+        """
+        # Validar la planificación generada
+        validation_result = self.schedule.is_valid_schedule(schedule, self.graph, max_credits_per_semester, completed)
+        
+        # Convertir a formato más detallado
+        schedule_details = {}
+        total_credits = 0
+        
+        for semester, courses in schedule.items():
+            semester_info = []
+            semester_credits = 0
+            
+            for course_id in courses:
+                course = self.graph.get_course(course_id)
+                if course:
+                    semester_info.append({
+                        "id": course.id,
+                        "name": course.name,
+                        "credits": course.credits,
+                        "prereqs": course.prereqs
+                    })
+                    semester_credits += course.credits
+            
+            schedule_details[semester] = {
+                "courses": semester_info,
+                "total_courses": len(semester_info),
+                "total_credits": semester_credits
+            }
+            total_credits += semester_credits
+        
+        # Cota inferior O(V+E) para saber qué tan lejos del óptimo está el plan
+        snapshot = self.graph.snapshot()
+        bounds = SemesterBounds.of(snapshot)
+        if completed is None:
+            lower_bound = bounds.lower_bound(max_credits_per_semester)["lower_bound"]
+        else:
+            done = self.schedule._done_indices(snapshot, completed)
+            lower_bound = bounds.remaining_lower_bound(max_credits_per_semester, done)
+        
+        return {
+            "success": True,
+            "schedule": schedule_details,
+            "total_semesters": len(schedule),
+            "total_courses": sum(len(courses) for courses in schedule.values()),
+            "total_credits": total_credits,
+            "valid": validation_result["valid"],
+            "errors": validation_result["errors"],
+            "lower_bound": lower_bound,
+            "gap": len(schedule) - lower_bound
+        }
+    
+    def iter_alternatives(self, max_credits_per_semester: int = 18, limit: Optional[int] = 5,
+                          time_budget: Optional[float] = 10.0) -> Iterator[Dict[str, Any]]:
+        """
+        Genera planificaciones alternativas distintas, todas con el mejor número
+        de semestres conocido. Se calculan a medida que se piden: detener la
+        iteración no deja trabajo pendiente.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            limit: Número máximo de planes (None = sin límite)
+            time_budget: Tiempo máximo de búsqueda en segundos (None = sin límite)
+            
+        Yields:
+            Un diccionario por plan (formato de generate_random_schedule) con su
+            número de alternativa
+        """
+        if not self.graph:
+            yield {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+            return
+        
+        try:
+            plans = self.schedule.iter_alternatives(max_credits_per_semester, self.graph, time_budget)
+            for number, schedule in enumerate(plans, start=1):
+                result = self._build_schedule_result(schedule, max_credits_per_semester)
+                result["alternative"] = number
+                yield result
+                if limit is not None and number >= limit:
+                    return
+            
+        except Exception as e:
+            yield {
+                "success": False,
+                "error": "ALTERNATIVES_ERROR",
+                "message": f"Error al generar planificaciones alternativas: {str(e)}",
+                "details": str(e)
+            }
+    
+    def generate_exact_schedule(self, max_credits_per_semester: int = 18, time_budget: float = 2.0) -> Dict[str, Any]:
+        """
+        Genera una planificación con el mínimo número de semestres (ramificación y poda).
+        Si se agota el tiempo, retorna la mejor encontrada y la brecha demostrada.
+        
+        Args:
+            max_credits_per_semester: Límite de créditos por semestre
+            time_budget: Tiempo máximo de búsqueda en segundos
+            
+        Returns:
+            Diccionario con la planificación generada, su cota inferior y su brecha
+        """
+        if not self.graph:
+            return {
+                "success": False,
+                "error": "GRAPH_NOT_LOADED",
+                "message": "El grafo no ha sido cargado"
+            }
+        
+        try:
+            solution = self.schedule.exact_schedule(max_credits_per_semester, self.graph, time_budget)
+            result = self._build_schedule_result(solution["schedule"], max_credits_per_semester)
+            result["lower_bound"] = max(result["lower_bound"], solution["lower_bound"])
+            result["gap"] = result["total_semesters"] - result["lower_bound"]
+            result["optimal"] = solution["optimal"]
+            return result
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": "EXACT_SCHEDULE_ERROR",
+                "message": f"Error al generar planificación exacta: {str(e)}",
+                "details": str(e)
+            }
+    
     '''def generate_greedy_schedule(self, max_credits_per_semester: int = 18) -> Dict[str, Any]:
         """
         Genera una planificación greedy que maximiza los créditos por semestre.
@@ -0,0 +1,71 @@
+from typing import List, Tuple, Optional, Sequence, Dict, Any
+from graduacion_unal.models.courses_schedule import Schedule
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+from graduacion_unal.models.removal_impact import RemovalImpact
+
+### FUNCIONES PARA PROCESOS TRABAJADORES (ProcessPoolExecutor)
+## La vista del grafo se envía una sola vez por proceso, al iniciarlo
+
+_snapshot: Optional[GraphSnapshot] = None
+_critical: Optional[List[int]] = None
+_schedule = Schedule()
+_impacts: Dict[int, RemovalImpact] = {}
+
+
+def init_worker(snapshot: GraphSnapshot, critical: List[int]) -> None:
+    """
+    Inicializa el estado del proceso trabajador.
+
+    Args:
+        snapshot: Vista compacta del grafo de cursos
+        critical: Créditos de camino crítico de cada índice de curso
+    """
+    global _snapshot, _critical
+    _snapshot = snapshot
+    _critical = critical
+    _impacts.clear()
+
+
+def randomized_plan(max_credits: int, noise: float, seed: int) -> Tuple[int, List[List[int]]]:
+    """
+    Ejecuta una corrida de la planificación aleatoria con la semilla dada.
+
+    Returns:
+        Tupla (semilla, plan como lista de semestres de índices)
+    """
+    return seed, _schedule._randomized_plan(_snapshot, max_credits, _critical, seed, noise)
+
+
+def remaining_plan(max_credits: int, done: Sequence[int]) -> List[List[int]]:
+    """
+    Planifica los cursos que no están en `done` (índices ya aprobados).
+
+    Returns:
+        Plan como lista de semestres de índices
+    """
+    return _schedule._remaining_plan(_snapshot, max_credits, _critical, list(done))
+
+
+def beam_expand(max_credits: int, branching: int, state: Tuple) -> List[Tuple]:
+    """
+    Expande un estado del haz de Schedule.beam_schedule.
+
+    Returns:
+        Lista de hijos (semestre, completados, disponibles, créditos pendientes)
+    """
+    return _schedule._beam_expand(_snapshot, _critical, max_credits, branching, state)
+
+
+def removal_impact(max_credits: int, courses: Sequence[int]) -> List[Dict[str, Any]]:
+    """
+    Analiza el efecto de eliminar cada curso del bloque (índices). El
+    analizador se construye una vez por proceso y tope de créditos.
+
+    Returns:
+        Lista con el resultado de RemovalImpact.analyze para cada curso
+    """
+    impact = _impacts.get(max_credits)
+    if impact is None:
+        impact = RemovalImpact(_snapshot, _critical, max_credits)
+        _impacts[max_credits] = impact
+    return [impact.analyze(u) for u in courses]
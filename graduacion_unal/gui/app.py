@@ -55,8 +55,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # === Configuracion de la API === #
 
-        # Instancia el servicio de cursos
-        self.courses_service = CoursesService()
+        # Instancia el servicio de cursos (los planes se conservan entre sesiones)
+        self.courses_service = CoursesService(use_disk_cache=True)
 
         # === Configuracion de layout y botones === #
 
@@ -775,6 +775,10 @@ class MainWindow(QtWidgets.QMainWindow):
         # Generar tabla inicial
         actualizar_tabla()
 
+        # Precalcular en segundo plano los demás topes del selector para que cambiar el valor sea inmediato
+        self.courses_service.prefetch_schedules_for_caps(
+            [cap for cap in range(spin_creditos.minimum(), spin_creditos.maximum() + 1) if cap != spin_creditos.value()])
+
         # Limpiar y agregar el layout al panel principal
         self.limpiar_panel()
         self.panel_layout.addLayout(layout)
@@ -1,9 +1,16 @@
 from graduacion_unal.structures.hash import HashMap
 from graduacion_unal.structures.disjoint_sets import DisjointSets
+from graduacion_unal.structures.heap import MaxHeap
+from graduacion_unal.structures.queue import Queue
 from graduacion_unal.models.Courses import Course
-from typing import List, Optional
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+from typing import List, Dict, Optional, Tuple, Iterator, Callable, Union
+import itertools
 import time
 
+# Contador global: cada modificación de cualquier grafo recibe una versión única
+_graph_versions = itertools.count(1)
+
 class CoursesGraph:
     """
     Clase que representa un grafo dirigido de materias (Nodos), y prerrequisitos (Aristas)
@@ -12,12 +19,317 @@ class CoursesGraph:
         adjacency_list: HashMap que almacena la lista de "dependencias" del grafo.
         number_nodes: Número de nodos(prerrequisitos) en el grafo.
         courses_map: HashMap que mapea ID de curso -> objeto Course.
+        version: Identificador que cambia con cada modificación del grafo.
     """
 
     def __init__(self):
         self.adjacency_list = HashMap()
         self.courses_map = HashMap()
         self.number_nodes: int = 0
+        self.version: int = next(_graph_versions)
+        self._snapshot: Optional[GraphSnapshot] = None
+        # Orden topológico incremental: posiciones (slots) que pueden tener huecos
+        self._topo_slots: Optional[List[Optional[int]]] = None
+        self._topo_pos: Dict[int, int] = {}
+        self._topo_cache: Optional[List[int]] = None
+        self._levels: Dict[int, int] = {}
+
+    def _touch(self) -> None:
+        """
+        Marca el grafo como modificado, invalidando las vistas derivadas.
+        """
+        self.version = next(_graph_versions)
+        self._snapshot = None
+
+    def snapshot(self) -> GraphSnapshot:
+        """
+        Obtiene una vista compacta basada en índices del grafo actual.
+        La vista se reutiliza mientras el grafo no sea modificado.
+
+        Returns:
+            Instancia de GraphSnapshot de la versión actual
+        """
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = GraphSnapshot.from_graph(self)
+        return self._snapshot
+
+    def _ensure_order(self) -> bool:
+        """
+        Construye (si hace falta) el orden topológico y los niveles con Kahn en O(V+E).
+        
+        Returns:
+            True si el orden está disponible, False si el grafo tiene ciclos
+        """
+        if self._topo_slots is not None:
+            return True
+        
+        in_degree: Dict[int, int] = {course_id: 0 for course_id in self.courses_map.keys()}
+        for course_id in in_degree:
+            for neighbor_id in self.get_neighbors(course_id):
+                if neighbor_id in in_degree:
+                    in_degree[neighbor_id] += 1
+        
+        cola = Queue()
+        levels: Dict[int, int] = {}
+        for course_id, deg in in_degree.items():
+            if deg == 0:
+                cola.enqueue(course_id)
+                levels[course_id] = 1
+        
+        order: List[int] = []
+        while not cola.is_empty():
+            u = cola.dequeue()
+            order.append(u)
+            for v in self.get_neighbors(u):
+                if v not in in_degree:
+                    continue
+                if levels.get(v, 0) < levels[u] + 1:
+                    levels[v] = levels[u] + 1
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    cola.enqueue(v)
+        
+        if len(order) < len(in_degree):
+            return False
+        
+        self._topo_slots = list(order)
+        self._topo_pos = {course_id: pos for pos, course_id in enumerate(order)}
+        self._topo_cache = order
+        self._levels = levels
+        return True
+
+    def _reset_order(self) -> None:
+        """
+        Descarta el orden topológico incremental; se reconstruye al pedirlo.
+        """
+        self._topo_slots = None
+        self._topo_pos = {}
+        self._topo_cache = None
+        self._levels = {}
+
+    def topological_order(self) -> List[int]:
+        """
+        Obtiene un orden topológico de los IDs de curso (prerrequisitos primero).
+        
+        El orden se mantiene incrementalmente con las operaciones de modificación,
+        por lo que las consultas repetidas no recorren el grafo. La lista retornada
+        es compartida y no debe modificarse.
+        
+        Returns:
+            Lista de IDs de curso en orden topológico
+            
+        Raises:
+            ValueError: Si el grafo tiene ciclos
+        """
+        if not self._ensure_order():
+            raise ValueError("El grafo de prerrequisitos tiene ciclos")
+        if self._topo_cache is None:
+            self._topo_cache = [course_id for course_id in self._topo_slots if course_id is not None]
+            # Compactar las posiciones cuando los huecos dominan
+            if len(self._topo_cache) * 2 < len(self._topo_slots):
+                self._topo_slots = list(self._topo_cache)
+                self._topo_pos = {course_id: pos for pos, course_id in enumerate(self._topo_cache)}
+        return self._topo_cache
+
+    def iter_topological(self, order_key: Union[None, str, Callable[[Course], object]] = None,
+                         method: str = "kahn") -> Iterator[int]:
+        """
+        Recorre los cursos en orden topológico de forma perezosa (generador).
+        
+        Cada curso se produce apenas se conoce su posición, de modo que quien solo
+        necesita los primeros K cursos puede detenerse sin pagar el orden completo.
+        
+        Args:
+            order_key: Criterio de desempate entre cursos disponibles:
+                None para FIFO, "credits" para más créditos primero, "critical"
+                para mayor camino crítico en créditos primero, o una función
+                Course -> valor (mayor valor primero)
+            method: "kahn" (por disponibilidad) o "dfs" (cada curso aparece
+                justo después de sus prerrequisitos pendientes)
+            
+        Yields:
+            IDs de curso en orden topológico
+            
+        Raises:
+            ValueError: Si el método o el criterio no son válidos, o si el grafo
+                tiene ciclos (igual que topological_order)
+        """
+        if method not in ("kahn", "dfs"):
+            raise ValueError(f"Método de orden topológico desconocido: {method}")
+        snap = self.snapshot()
+        snap.require_acyclic()
+        if order_key is None:
+            priority = None
+        elif order_key == "credits":
+            priority = snap.credits
+        elif order_key == "critical":
+            priority = snap.critical_credits()
+        elif callable(order_key):
+            priority = [order_key(self.courses_map.get(course_id)) for course_id in snap.ids]
+        else:
+            raise ValueError(f"Criterio de orden desconocido: {order_key}")
+        
+        if method == "kahn":
+            return self._iter_kahn(snap, priority)
+        return self._iter_dfs(snap, priority)
+
+    @staticmethod
+    def _iter_kahn(snap: GraphSnapshot, priority: Optional[list]) -> Iterator[int]:
+        """
+        Kahn perezoso: una cola FIFO o un MaxHeap de (prioridad, -índice).
+        La vista debe ser acíclica.
+        """
+        in_degree = [len(p) for p in snap.pred]
+        if priority is None:
+            disponibles = Queue()
+            push, pop = disponibles.enqueue, disponibles.dequeue
+        else:
+            disponibles = MaxHeap()
+            push = lambda u: disponibles.push((priority[u], -u))
+            pop = lambda: -disponibles.pop()[1]
+        
+        for u, deg in enumerate(in_degree):
+            if deg == 0:
+                push(u)
+        while not disponibles.is_empty():
+            u = pop()
+            yield snap.ids[u]
+            for v in snap.succ[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    push(v)
+
+    @staticmethod
+    def _iter_dfs(snap: GraphSnapshot, priority: Optional[list]) -> Iterator[int]:
+        """
+        DFS perezoso sobre los prerrequisitos: un curso se produce al terminar
+        de explorar sus prerrequisitos (post-orden), lo que respeta el orden
+        topológico. La vista debe ser acíclica.
+        """
+        roots = range(len(snap))
+        if priority is not None:
+            roots = sorted(roots, key=lambda u: (priority[u], -u), reverse=True)
+        
+        # 0 = sin visitar, 1 = en exploración o producido
+        state = [0] * len(snap)
+        for root in roots:
+            if state[root]:
+                continue
+            state[root] = 1
+            stack = [(root, iter(snap.pred[root]))]
+            while stack:
+                u, prereqs = stack[-1]
+                for p in prereqs:
+                    if state[p] == 0:
+                        state[p] = 1
+                        stack.append((p, iter(snap.pred[p])))
+                        break
+                else:
+                    stack.pop()
+                    yield snap.ids[u]
+
+    def levels(self) -> Dict[int, int]:
+        """
+        Obtiene el nivel de cada curso: 1 para cursos sin prerrequisitos y, en otro
+        caso, 1 + el máximo nivel de sus prerrequisitos.
+        
+        Los niveles se mantienen incrementalmente; el diccionario retornado es
+        compartido y no debe modificarse.
+        
+        Returns:
+            Diccionario ID de curso -> nivel
+            
+        Raises:
+            ValueError: Si el grafo tiene ciclos
+        """
+        if not self._ensure_order():
+            raise ValueError("El grafo de prerrequisitos tiene ciclos")
+        return self._levels
+
+    def _existing_prereqs(self, course_id: int) -> List[int]:
+        """
+        Prerrequisitos de un curso unidos a él por una arista del grafo (los
+        mismos que ve GraphSnapshot). Un prerrequisito declarado que se añadió
+        al grafo después del curso no tiene arista y no cuenta.
+        """
+        return [prereq_id for prereq_id in self.courses_map.get(course_id).prereqs
+                if prereq_id in self._topo_pos and course_id in self.adjacency_list.get(prereq_id)]
+
+    def _propagate_levels(self, start_ids: List[int]) -> None:
+        """
+        Recalcula los niveles a partir de los cursos dados, avanzando hacia sus
+        dependientes solo mientras los niveles cambien. Los cursos se procesan en
+        orden topológico (heap por posición) para tocar cada uno una sola vez.
+        """
+        pendientes = MaxHeap()
+        en_heap = set()
+        for course_id in start_ids:
+            if course_id in self._topo_pos and course_id not in en_heap:
+                en_heap.add(course_id)
+                pendientes.push((-self._topo_pos[course_id], course_id))
+        
+        while not pendientes.is_empty():
+            _, course_id = pendientes.pop()
+            level = 1
+            for prereq_id in self._existing_prereqs(course_id):
+                if self._levels[prereq_id] + 1 > level:
+                    level = self._levels[prereq_id] + 1
+            if level == self._levels.get(course_id):
+                continue
+            self._levels[course_id] = level
+            for dependent_id in self.get_neighbors(course_id):
+                if dependent_id in self._topo_pos and dependent_id not in en_heap:
+                    en_heap.add(dependent_id)
+                    pendientes.push((-self._topo_pos[dependent_id], dependent_id))
+
+    def _reorder_for_edge(self, prereq_id: int, course_id: int) -> bool:
+        """
+        Ajusta el orden topológico tras añadir la arista prereq_id -> course_id
+        (algoritmo de Pearce-Kelly). Solo se visitan los cursos cuya posición está
+        entre las de los dos extremos.
+        
+        Returns:
+            True si el orden se ajustó, False si la arista crea un ciclo
+        """
+        pos = self._topo_pos
+        lower, upper = pos[course_id], pos[prereq_id]
+        if lower > upper:
+            return True
+        
+        # Cursos alcanzables desde course_id dentro de la ventana
+        forward: List[int] = []
+        visited = {course_id}
+        stack = [course_id]
+        while stack:
+            u = stack.pop()
+            forward.append(u)
+            for v in self.get_neighbors(u):
+                if v == prereq_id:
+                    return False
+                if v not in visited and v in pos and pos[v] < upper:
+                    visited.add(v)
+                    stack.append(v)
+        
+        # Cursos que alcanzan prereq_id dentro de la ventana
+        backward: List[int] = []
+        visited = {prereq_id}
+        stack = [prereq_id]
+        while stack:
+            u = stack.pop()
+            backward.append(u)
+            for v in self._existing_prereqs(u):
+                if v not in visited and pos[v] > lower:
+                    visited.add(v)
+                    stack.append(v)
+        
+        backward.sort(key=pos.__getitem__)
+        forward.sort(key=pos.__getitem__)
+        moved = backward + forward
+        for slot, u in zip(sorted(pos[u] for u in moved), moved):
+            self._topo_slots[slot] = u
+            pos[u] = slot
+        self._topo_cache = None
+        return True
 
     def build_from_courses(self, courses: List[Course]) -> None:
         """
@@ -30,6 +342,8 @@ class CoursesGraph:
         self.adjacency_list = HashMap()
         self.courses_map = HashMap()
         self.number_nodes = 0
+        self._touch()
+        self._reset_order()
         
         # Añadir todos los cursos al mapa
         for course in courses:
@@ -132,6 +446,14 @@ class CoursesGraph:
                     if course.id not in current_adjacent:
                         current_adjacent.append(course.id)
                         self.adjacency_list.put(prereq_id, current_adjacent)
+            
+            # Un curso nuevo no tiene dependientes: puede ir al final del orden
+            if self._topo_slots is not None:
+                self._topo_pos[course.id] = len(self._topo_slots)
+                self._topo_slots.append(course.id)
+                self._topo_cache = None
+                self._propagate_levels([course.id])
+            self._touch()
 
     def remove_node(self, course_id: int) -> bool:
         """
@@ -151,17 +473,35 @@ class CoursesGraph:
         # Remover de la lista de adyacencia
         self.adjacency_list.remove(course_id)
         
+        # Remover de las listas de dependientes de sus prerrequisitos
+        for prereq_id in course.prereqs:
+            if self.courses_map.contains(prereq_id):
+                self.courses_map.get(prereq_id).remove_dependent_course(course_id)
+                current_adjacent = self.adjacency_list.get(prereq_id)
+                if course_id in current_adjacent:
+                    current_adjacent.remove(course_id)
+        
         # Remover de los cursos dependientes
+        dependents = []
         for dependent_id in course.adjacent:
             if self.courses_map.contains(dependent_id):
                 dependent_course = self.courses_map.get(dependent_id)
                 dependent_course.prereqs.remove(course_id)
                 dependent_course.in_degree = len(dependent_course.prereqs)
+                dependents.append(dependent_id)
         
         # Remover del mapa de cursos
         self.courses_map.remove(course_id)
         self.number_nodes -= 1
         
+        # Quitar un nodo no invalida el orden topológico; solo deja un hueco
+        if self._topo_slots is not None:
+            self._topo_slots[self._topo_pos.pop(course_id)] = None
+            self._levels.pop(course_id, None)
+            self._topo_cache = None
+            self._propagate_levels(dependents)
+        self._touch()
+        
         return True
 
     def add_vertex(self, prereq_id: int, course_id: int) -> bool:
@@ -202,8 +542,14 @@ class CoursesGraph:
             current_adjacent.append(course_id)
             self.adjacency_list.put(prereq_id, current_adjacent)
         
-        # Verificar si se creó un ciclo
-        if self._has_cycle():
+        # Verificar si se creó un ciclo: con el orden incremental basta revisar la
+        # región entre ambos cursos; sin él se recorre el grafo completo
+        if self._ensure_order():
+            creates_cycle = not self._reorder_for_edge(prereq_id, course_id)
+        else:
+            creates_cycle = self._has_cycle()
+        
+        if creates_cycle:
             # Revertir el cambio
             course.prereqs.remove(prereq_id)
             course.in_degree = len(course.prereqs)
@@ -212,6 +558,9 @@ class CoursesGraph:
             self.adjacency_list.put(prereq_id, current_adjacent)
             raise ValueError("No se puede añadir la relación: se detectó un ciclo")
         
+        if self._topo_slots is not None:
+            self._propagate_levels([course_id])
+        self._touch()
         return True
 
     def remove_edge(self, prereq_id: int, course_id: int) -> bool:
@@ -241,12 +590,16 @@ class CoursesGraph:
             prereq_course = self.courses_map.get(prereq_id)
             prereq_course.remove_dependent_course(course_id)
         
-        # Actualizar lista de adyacencia
-        current_adjacent = self.adjacency_list.get(prereq_id)
-        if course_id in current_adjacent:
-            current_adjacent.remove(course_id)
-            self.adjacency_list.put(prereq_id, current_adjacent)
+            # Actualizar lista de adyacencia
+            current_adjacent = self.adjacency_list.get(prereq_id)
+            if course_id in current_adjacent:
+                current_adjacent.remove(course_id)
+                self.adjacency_list.put(prereq_id, current_adjacent)
         
+        # Quitar una arista mantiene válido el orden; solo pueden bajar niveles
+        if self._topo_slots is not None:
+            self._propagate_levels([course_id])
+        self._touch()
         return True
 
     def _has_cycle(self) -> bool:
@@ -318,6 +671,45 @@ class CoursesGraph:
         except KeyError:
             return []
     
+    def redundant_edges(self) -> List[Tuple[int, int]]:
+        """
+        Obtiene los prerrequisitos redundantes: aristas prereq -> curso tales que
+        el curso ya depende transitivamente de prereq por otro camino.
+        
+        Returns:
+            Lista de pares (prereq_id, course_id)
+            
+        Raises:
+            ValueError: Si el grafo tiene ciclos
+        """
+        snap = self.snapshot()
+        return [(snap.ids[u], snap.ids[v]) for u, v in snap.redundant_edges()]
+
+    def transitive_reduction(self) -> 'CoursesGraph':
+        """
+        Construye la reducción transitiva del grafo: el grafo mínimo con las mismas
+        relaciones de alcanzabilidad. Los planificadores producen los mismos
+        resultados sobre el grafo reducido, con menos aristas que recorrer.
+        
+        Los cursos del grafo reducido son copias; el grafo original no se modifica.
+        
+        Returns:
+            Nuevo CoursesGraph sin aristas redundantes
+            
+        Raises:
+            ValueError: Si el grafo tiene ciclos
+        """
+        redundant = set(self.redundant_edges())
+        courses = []
+        for course in self.get_all_courses():
+            prereqs = [prereq_id for prereq_id in course.prereqs
+                       if self.courses_map.contains(prereq_id) and (prereq_id, course.id) not in redundant]
+            courses.append(Course(course.id, prereqs, course.name, course.credits))
+        
+        reduced = CoursesGraph()
+        reduced.build_from_courses(courses)
+        return reduced
+    
     def __str__(self) -> str:
         lines = []
         for course_id, course in self.courses_map.items():
@@ -1,9 +1,17 @@
+import math
 import random
-from typing import List, Dict, Any, Set
+import time
+from itertools import islice
+from typing import List, Dict, Any, Set, Tuple, Iterator, Optional, Callable
 from graduacion_unal.models.courses_graph import CoursesGraph
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+from graduacion_unal.models.semester_bounds import SemesterBounds
+from graduacion_unal.models.plan_state import PlanState
 from graduacion_unal.models.Courses import Course
-from graduacion_unal.structures.queue import Queue
 from graduacion_unal.structures.heap import MaxHeap
+from graduacion_unal.structures.disjoint_sets import DisjointSets
+from graduacion_unal.structures.segment_tree import CapacitySegmentTree
+from graduacion_unal.structures.credit_frontier import CreditBucketFrontier
 
 class Schedule:
     """
@@ -15,7 +23,8 @@ class Schedule:
     def __init__(self):
         pass
 
-    def tree_of_availible_courses(self, max_credits_per_semester: int, courses_graph: CoursesGraph) -> Dict[int, List[int]]:
+    def tree_of_availible_courses(self, max_credits_per_semester: int, courses_graph: CoursesGraph,
+                                  credit_aware: bool = False) -> Dict[int, List[int]]:
         """
         Metodo para calcular el numero minimo de semestres necesarios para completar el plan de estudios.
         
@@ -34,62 +43,64 @@ class Schedule:
         En el semestre 3 se puede tomar todas las de nivel 3.
 
         NOTA: Pueden excederse de los creditos permitidos por semestre, el arbol solo
-        representa las asignaturas que se pueden tomar en un semestre.    
+        representa las asignaturas que se pueden tomar en un semestre.
+
+        En un grafo acíclico se usan los niveles que CoursesGraph.levels()
+        mantiene incrementalmente. Con ciclos, los niveles se calculan de forma
+        iterativa recorriendo el orden de Kahn de la vista del grafo (en caché
+        por versión); los cursos que forman parte de un ciclo, o que dependen
+        de uno, no tienen nivel y no aparecen en el árbol (ver blocked_courses).
+
+        Si credit_aware es True (y el grafo es acíclico), el nivel de cada curso
+        es además el primer semestre en que puede cursarse respetando el tope
+        de créditos: no puede ir antes de completar los créditos de todos sus
+        prerrequisitos transitivos (SemesterBounds.earliest).
         """
         if not courses_graph:
             return {}
         
-        # Obtener todos los cursos
-        all_courses = courses_graph.get_all_courses()
+        snapshot = courses_graph.snapshot()
+        if credit_aware and snapshot.acyclic:
+            levels = SemesterBounds.of(snapshot).earliest(max_credits_per_semester)
+        elif snapshot.acyclic:
+            # Niveles mantenidos incrementalmente por el grafo
+            course_levels = courses_graph.levels()
+            levels = [course_levels[course_id] for course_id in snapshot.ids]
+        else:
+            levels = snapshot.memo('levels', self._kahn_levels)
         
-        # Calcular niveles de cada curso
-        course_levels = {}
-        visited = set()
-        
-        def calculate_level(course_id: int) -> int:
-            """Calcula el nivel de un curso basado en sus prerrequisitos.
-            
-            Definicion recursiva de "profundidad" de un curso.
+        # Organizar cursos por nivel, en orden topológico dentro de cada nivel
+        tree: Dict[int, List[int]] = {}
+        for u in snapshot.order:
+            tree.setdefault(levels[u], []).append(snapshot.ids[u])
+        return dict(sorted(tree.items()))
 
-            Numero minimo de semestres necesarios para poder ver el curso.
-            """
-            if course_id in course_levels:
-                return course_levels[course_id]
-            
-            if course_id in visited:
-                return 0  # Evitar ciclos
-            
-            visited.add(course_id)
-            course = courses_graph.get_course(course_id)
-            
-            if not course or not course.prereqs:
-                course_levels[course_id] = 1
-                return 1
-            
-            # El nivel es el máximo nivel de los prerrequisitos + 1
-            max_prereq_level = 0
-            for prereq_id in course.prereqs:
-                prereq_level = calculate_level(prereq_id)
-                max_prereq_level = max(max_prereq_level, prereq_level)
-            
-            course_levels[course_id] = max_prereq_level + 1
-            return course_levels[course_id]
-        
-        # Calcular niveles para todos los cursos
-        for course in all_courses:
-            if course.id not in course_levels:
-                calculate_level(course.id)
-        
-        # Organizar cursos por nivel
-        tree = {}
-        for course_id, level in course_levels.items():
-            if level not in tree:
-                tree[level] = []
-            tree[level].append(course_id)
-        
-        return tree
+    @staticmethod
+    def _kahn_levels(snapshot: GraphSnapshot) -> List[int]:
+        """
+        Nivel (profundidad 1-based) de cada curso sobre el orden de Kahn de la
+        vista. Los cursos fuera del orden (ciclos) quedan con nivel 0.
+        """
+        levels = [0] * len(snapshot)
+        for u in snapshot.order:
+            # Todos los prerrequisitos de u aparecen antes en el orden
+            levels[u] = max((levels[p] for p in snapshot.pred[u]), default=0) + 1
+        return levels
 
-    def is_valid_schedule(self, schedule: Dict[int, List[int]], courses_graph: CoursesGraph, max_credits_per_semester: int) -> Dict[str, Any]:
+    def blocked_courses(self, courses_graph: CoursesGraph) -> List[int]:
+        """
+        Returns:
+            IDs de los cursos que forman parte de un ciclo de prerrequisitos o
+            dependen de uno (no pueden cursarse nunca)
+        """
+        snapshot = courses_graph.snapshot()
+        if snapshot.acyclic:
+            return []
+        ordered = set(snapshot.order)
+        return [course_id for u, course_id in enumerate(snapshot.ids) if u not in ordered]
+
+    def is_valid_schedule(self, schedule: Dict[int, List[int]], courses_graph: CoursesGraph, max_credits_per_semester: int,
+                          completed_courses: Optional[List[int]] = None, fail_fast: bool = False) -> Dict[str, Any]:
         """
         Metodo para verificar si una planificacion de semestres es valida. Con base a los prerequisitos y un tope de creditos por semestre.
         
@@ -102,6 +113,22 @@ class Schedule:
         }
 
         Revisar que las asignaturas de cada semestre sean validas, es decir, que se cumplan los prerequisitos y que el numero de creditos no exceda el maximo permitido por semestre.
+
+        Si se dan completed_courses (cursos aprobados o en curso antes del plan),
+        cuentan como prerrequisitos ya cumplidos.
+
+        Primero se arma un arreglo curso -> semestre (el primero en que aparece)
+        sobre los índices de la vista del grafo; luego una sola pasada suma los
+        créditos de cada semestre y revisa cada arista prerrequisito una vez.
+        Los prerrequisitos declarados en Course.prereqs que no son aristas del
+        grafo (por ejemplo, un curso que no existe) se revisan aparte, con el
+        semestre en que aparece su ID en el plan. Durante la pasada solo se
+        anotan las violaciones; los mensajes se construyen al final. Costo
+        O(V + E) sin búsquedas en el HashMap.
+
+        Args:
+            fail_fast: Si es True, se detiene en la primera violación (el
+                resultado trae a lo sumo un error).
         """
         if not courses_graph:
             return {
@@ -109,36 +136,72 @@ class Schedule:
                 "errors": ["Grafo de cursos no cargado"]
             }
         
-        errors = []
-        completed_courses = set()
+        snapshot = courses_graph.snapshot()
+        index = snapshot.index
+        credits = snapshot.credits
+        pred = snapshot.pred
+        semesters = sorted(schedule.keys())
         
-        # Verificar cada semestre en orden
-        for semester in sorted(schedule.keys()):
-            semester_courses = schedule[semester]
-            
-            # Verificar créditos del semestre
+        # Semestre (posición 1..K) en que se cursa cada curso; 0 = aprobado antes
+        # del plan, K + 1 = no aparece en el plan
+        rank = [len(semesters) + 1] * len(snapshot)
+        # Igual para los IDs que no están en el grafo
+        outside: Dict[int, int] = {}
+        for course_id in completed_courses or ():
+            u = index.get(course_id)
+            if u is not None:
+                rank[u] = 0
+            else:
+                outside[course_id] = 0
+        for k, semester in enumerate(semesters, start=1):
+            for course_id in schedule[semester]:
+                u = index.get(course_id)
+                if u is None:
+                    outside.setdefault(course_id, k)
+                elif rank[u] > k:
+                    rank[u] = k
+        
+        def prereq_rank(prereq_id: int) -> int:
+            p = index.get(prereq_id)
+            return rank[p] if p is not None else outside.get(prereq_id, len(semesters) + 1)
+        
+        extra = snapshot.memo('extra_prereqs', lambda snap: self._extra_prereqs(snap, courses_graph))
+        
+        # Violaciones como tuplas (tipo, semestre, dato); se formatean al final
+        violations: List[Tuple[str, int, Any]] = []
+        for k, semester in enumerate(semesters, start=1):
             semester_credits = 0
-            for course_id in semester_courses:
-                course = courses_graph.get_course(course_id)
-                if course:
-                    semester_credits += course.credits
+            found: List[int] = []
+            for course_id in schedule[semester]:
+                u = index.get(course_id)
+                if u is None:
+                    violations.append(("missing", semester, course_id))
+                    if fail_fast:
+                        break
                 else:
-                    errors.append(f"Curso {course_id} no encontrado en el semestre {semester}")
+                    semester_credits += credits[u]
+                    found.append(u)
+            if fail_fast and violations:
+                break
             
             if semester_credits > max_credits_per_semester:
-                errors.append(f"Semestre {semester} excede el límite de créditos: {semester_credits} > {max_credits_per_semester}")
-            
-            # Verificar prerrequisitos
-            for course_id in semester_courses:
-                course = courses_graph.get_course(course_id)
-                if course:
-                    for prereq_id in course.prereqs:
-                        if prereq_id not in completed_courses:
-                            errors.append(f"Curso {course_id} en semestre {semester} requiere prerrequisito {prereq_id} que no ha sido completado")
+                violations.append(("credits", semester, semester_credits))
+                if fail_fast:
+                    break
             
-            # Agregar cursos del semestre a completados
-            completed_courses.update(semester_courses)
+            for u in found:
+                if (any(rank[p] >= k for p in pred[u])
+                        or (u in extra and any(prereq_rank(prereq_id) >= k for prereq_id in extra[u]))):
+                    violations.append(("prereqs", semester, u))
+                    if fail_fast:
+                        break
+            if fail_fast and violations:
+                break
         
+        # Con fail_fast solo se formatea la primera violación (y su primer mensaje)
+        errors = self._format_violations(violations, snapshot, courses_graph, max_credits_per_semester, prereq_rank, semesters)
+        if fail_fast:
+            errors = errors[:1]
         return {
             "valid": len(errors) == 0,
             "errors": errors,
@@ -146,6 +209,42 @@ class Schedule:
             "total_courses": sum(len(courses) for courses in schedule.values())
         }
 
+    @staticmethod
+    def _extra_prereqs(snapshot: GraphSnapshot, courses_graph: CoursesGraph) -> Dict[int, List[int]]:
+        """
+        Returns:
+            Para cada índice de curso que los tenga, los IDs de prerrequisitos
+            declarados en Course.prereqs que no son aristas del grafo
+        """
+        extra: Dict[int, List[int]] = {}
+        for u, course_id in enumerate(snapshot.ids):
+            edges = {snapshot.ids[p] for p in snapshot.pred[u]}
+            missing = [prereq_id for prereq_id in courses_graph.get_course(course_id).prereqs if prereq_id not in edges]
+            if missing:
+                extra[u] = missing
+        return extra
+
+    def _format_violations(self, violations: List[Tuple[str, int, Any]], snapshot: GraphSnapshot, courses_graph: CoursesGraph,
+                           max_credits_per_semester: int, prereq_rank: Callable[[int], int], semesters: List[int]) -> List[str]:
+        """
+        Construye los mensajes de error de is_valid_schedule a partir de las
+        violaciones anotadas. Los prerrequisitos faltantes se listan en el
+        orden en que el curso los declara.
+        """
+        position = {semester: k for k, semester in enumerate(semesters, start=1)}
+        errors: List[str] = []
+        for kind, semester, data in violations:
+            if kind == "missing":
+                errors.append(f"Curso {data} no encontrado en el semestre {semester}")
+            elif kind == "credits":
+                errors.append(f"Semestre {semester} excede el límite de créditos: {data} > {max_credits_per_semester}")
+            else:
+                course_id = snapshot.ids[data]
+                k = position[semester]
+                for prereq_id in courses_graph.get_course(course_id).prereqs:
+                    if prereq_rank(prereq_id) >= k:
+                        errors.append(f"Curso {course_id} en semestre {semester} requiere prerrequisito {prereq_id} que no ha sido completado")
+        return errors
 
     def random_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph) -> Dict[int, List[int]]:
         """
@@ -158,99 +257,1048 @@ class Schedule:
         Returns:
             Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
         """
-        # Paso 1: Preprocesamiento
-        # Inicializar grado de entrada y estructuras
-        grado_entrada: Dict[int, int] = {}
-        max_credits: Dict[int, int] = {}
-        creditos: Dict[int, int] = {}
-
-        # Obtener todos los cursos y sus créditos
-        for course in courses_graph.get_all_courses():
-            cid = course.id
-            grado_entrada[cid] = 0
-            max_credits[cid] = 0
-            creditos[cid] = course.credits
-
-        # Calcular grado de entrada y grafo inverso
-        grafo_inverso: Dict[int, List[int]] = {cid: [] for cid in grado_entrada}
-        for cid in grado_entrada:
-            for succ in courses_graph.get_neighbors(cid):
-                grado_entrada[succ] += 1
-                grafo_inverso[succ].append(cid)
-
-        # Paso 2: Orden topológico inverso para camino crítico
-        cola = Queue()
-        orden_inverso: List[int] = []
-        for cid, deg in grado_entrada.items():
-            if deg == 0:
-                cola.enqueue(cid)
-
-        # Extraer en topológico y construir orden inverso
-        temp_entrada = grado_entrada.copy()
-        while not cola.is_empty():
-            u = cola.dequeue()
-            orden_inverso.insert(0, u)
-            for v in courses_graph.get_neighbors(u):
-                temp_entrada[v] -= 1
-                if temp_entrada[v] == 0:
-                    cola.enqueue(v)
-
-        # Calcular max_credits desde hojas hacia raíces
-        for u in orden_inverso:
-            max_credits[u] = creditos[u]
-            mayor = 0
-            for v in courses_graph.get_neighbors(u):
-                if max_credits[v] > mayor:
-                    mayor = max_credits[v]
-            max_credits[u] += mayor
-
-        # Paso 3: Reiniciar grado de entrada
-        grado_entrada = {cid: 0 for cid in grado_entrada}
-        for cid in grado_entrada:
-            for succ in courses_graph.get_neighbors(cid):
-                grado_entrada[succ] += 1
-
-        # Inicializar heap de disponibles
+        # Paso 1: Vista compacta del grafo (índices en orden de ID, en caché por versión)
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+
+        # Paso 2: Camino crítico (créditos) de cada curso
+        max_credits = courses_graph.snapshot().critical_credits()
+
+        # Paso 3: Asignación semestral por prioridad
+        plan = self._list_schedule(snapshot, max_creditos_semestre, max_credits)
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)}
+
+    def remaining_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, completed: List[int],
+                           in_progress: Optional[List[int]] = None) -> Dict[int, List[int]]:
+        """
+        Planifica solo los cursos que le faltan a un estudiante, a partir del
+        semestre siguiente. Los cursos completados y los que está cursando se
+        consideran aprobados.
+
+        Los cursos ya aprobados se descartan antes de planificar y la prioridad
+        de camino crítico es la global del grafo (en caché por versión), así que
+        el costo depende de los cursos restantes y no de toda la malla.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            completed: IDs de los cursos completados.
+            in_progress: IDs de los cursos que se están cursando.
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+
+        Raises:
+            ValueError: Si algún ID no existe en el grafo
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        done = self._done_indices(snapshot, list(completed) + list(in_progress or ()))
+        critical = courses_graph.snapshot().critical_credits()
+        plan = self._remaining_plan(snapshot, max_creditos_semestre, critical, done)
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)}
+
+    def _done_indices(self, snapshot: GraphSnapshot, course_ids: List[int]) -> List[int]:
+        """
+        Convierte IDs de cursos aprobados a índices de la vista.
+
+        Raises:
+            ValueError: Si algún ID no existe en el grafo
+        """
+        missing = [course_id for course_id in course_ids if course_id not in snapshot.index]
+        if missing:
+            raise ValueError(f"Cursos no encontrados en el grafo: {missing}")
+        return [snapshot.index[course_id] for course_id in course_ids]
+
+    def _remaining_plan(self, snapshot: GraphSnapshot, max_creditos_semestre: int, priority: List[Any],
+                        done: List[int]) -> List[List[int]]:
+        """
+        Planificación por lista de los cursos que no están en `done` (índices).
+        Trabaja solo sobre la vista compacta, por lo que puede ejecutarse en otro proceso.
+        """
+        aprobado = bytearray(len(snapshot))
+        for u in done:
+            aprobado[u] = 1
+        pending = [u for u in range(len(snapshot)) if not aprobado[u]]
+        self._check_course_credits(snapshot, max_creditos_semestre, pending)
+        return self._list_schedule(snapshot, max_creditos_semestre, priority, pending)
+
+    def randomized_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, seed: Optional[int] = None, noise: float = 0.1) -> Dict[int, List[int]]:
+        """
+        Variante aleatoria de random_schedule: la prioridad de camino crítico se
+        perturba con un ruido multiplicativo y los empates se rompen al azar.
+        Con la misma semilla el resultado es reproducible.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            seed: Semilla del generador aleatorio (None para no fijarla).
+            noise: Amplitud relativa del ruido sobre la prioridad (0 = solo desempates).
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        critical = courses_graph.snapshot().critical_credits()
+        plan = self._randomized_plan(snapshot, max_creditos_semestre, critical, seed, noise)
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)}
+
+    def _randomized_plan(self, snapshot: GraphSnapshot, max_creditos_semestre: int, critical: List[int],
+                         seed: Optional[int], noise: float) -> List[List[int]]:
+        """
+        Planificación por lista con prioridad (camino crítico con ruido, desempate aleatorio).
+        Trabaja solo sobre la vista compacta, por lo que puede ejecutarse en otro proceso.
+        """
+        rng = random.Random(seed)
+        priority = [(value * (1.0 + noise * rng.uniform(-1.0, 1.0)), rng.random()) for value in critical]
+        return self._list_schedule(snapshot, max_creditos_semestre, priority)
+
+    def earliest_fit_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph) -> Dict[int, List[int]]:
+        """
+        Planificación earliest-fit: los cursos se toman en orden topológico por
+        prioridad de camino crítico y cada uno se coloca en el primer semestre
+        posterior a sus prerrequisitos que aún tenga créditos libres suficientes.
+
+        A diferencia de random_schedule, un curso puede ocupar huecos de
+        semestres anteriores que quedaron con capacidad libre. La búsqueda del
+        semestre usa un CapacitySegmentTree (O(log S) por curso).
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        critical = courses_graph.snapshot().critical_credits()
+        credits = snapshot.credits
+
+        capacity = CapacitySegmentTree(max_creditos_semestre)
+        ready = [0] * len(snapshot)      # primer semestre (0-based) permitido
+        grado_entrada = [len(p) for p in snapshot.pred]
         disponibles = MaxHeap()
-        for cid, deg in grado_entrada.items():
+        for u, deg in enumerate(grado_entrada):
             if deg == 0:
-                # Usamos tupla (prioridad, créditos, id)
-                disponibles.push((max_credits[cid], creditos[cid], cid))
+                disponibles.push((critical[u], credits[u], u))
+
+        semestres: List[List[int]] = []
+        while not disponibles.is_empty():
+            _, cred, u = disponibles.pop()
+            k = capacity.find_first(ready[u], cred)
+            capacity.reserve(k, cred)
+            while len(semestres) <= k:
+                semestres.append([])
+            semestres[k].append(u)
+            for v in snapshot.succ[u]:
+                if k + 1 > ready[v]:
+                    ready[v] = k + 1
+                grado_entrada[v] -= 1
+                if grado_entrada[v] == 0:
+                    disponibles.push((critical[v], credits[v], v))
+
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(semestres)}
+
+    def balanced_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, passes: int = 4) -> Dict[int, List[int]]:
+        """
+        Planificación balanceada: mismo número de semestres que random_schedule,
+        con los créditos repartidos lo más parejo posible entre semestres.
+
+        Parte del plan de random_schedule y alterna pasadas hacia atrás
+        (retrasar cursos hacia los últimos semestres, que suelen quedar
+        incompletos) y hacia adelante. En cada pasada los cursos se recolocan
+        semestre por semestre dentro de la ventana que dejan sus dependientes
+        (o prerrequisitos) ya recolocados, en el semestre de menor carga si
+        eso reduce la diferencia con su semestre actual. Cada pasada conserva
+        la validez y no agrega semestres, y cuesta O(V log S + E) con la
+        consulta de menor carga de CapacitySegmentTree.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            passes: Número máximo de pasadas de balanceo.
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        critical = courses_graph.snapshot().critical_credits()
+
+        plan = self._list_schedule(snapshot, max_creditos_semestre, critical)
+        semester = [0] * len(snapshot)
+        for k, courses in enumerate(plan):
+            for u in courses:
+                semester[u] = k
+
+        for i in range(passes):
+            balanced = self._rebalance(snapshot, max_creditos_semestre, semester, len(plan), backward=(i % 2 == 0))
+            if balanced == semester:
+                break
+            semester = balanced
 
         semestres: Dict[int, List[int]] = {}
-        completados: Dict[int, bool] = {cid: False for cid in grado_entrada}
-        pendientes = len(grado_entrada)
-        semestre_idx = 1
+        for u in sorted(range(len(snapshot)), key=semester.__getitem__):
+            semestres.setdefault(semester[u], []).append(snapshot.ids[u])
+        # Renumerar por si algún semestre quedó vacío
+        return {k + 1: courses for k, courses in enumerate(semestres.values())}
+
+    def _rebalance(self, snapshot: GraphSnapshot, max_creditos_semestre: int, semester: List[int],
+                   total: int, backward: bool) -> List[int]:
+        """
+        Una pasada de balanceo sobre un plan válido (semestre 0-based por índice).
+
+        Los cursos se recolocan en orden de su semestre actual (descendente si
+        backward). Un curso solo puede ir a semestres posteriores (backward) o
+        anteriores al suyo, dentro de lo que permiten los cursos ya
+        recolocados; su semestre actual siempre tiene espacio porque solo
+        contiene cursos que ya estaban ahí. Se mueve al semestre de menor carga
+        de la ventana si esa carga es menor que la que quedaría en su semestre
+        sin él, lo que reduce la suma de cuadrados de las cargas.
+
+        Returns:
+            Nuevo semestre (0-based) de cada índice de curso
+        """
+        credits = snapshot.credits
+        # Créditos aún sin recolocar de cada semestre (se quedarían donde están)
+        pending = [0] * total
+        for u, k in enumerate(semester):
+            pending[k] += credits[u]
+        capacity = CapacitySegmentTree(max_creditos_semestre, total)
+        placed = [-1] * len(snapshot)
+
+        order = sorted(range(len(snapshot)), key=lambda u: (semester[u], credits[u]), reverse=backward)
+        for u in order:
+            cred = credits[u]
+            home = semester[u]
+            pending[home] -= cred
+            if backward:
+                start = home + 1
+                stop = min((placed[v] for v in snapshot.succ[u]), default=total)
+            else:
+                start = max((placed[p] for p in snapshot.pred[u]), default=-1) + 1
+                stop = home
+
+            k = home
+            best = capacity.most_free(start, stop)
+            if best != -1 and capacity.remaining(best) >= cred:
+                home_load = max_creditos_semestre - capacity.remaining(home) + pending[home]
+                if max_creditos_semestre - capacity.remaining(best) < home_load:
+                    k = best
+            capacity.reserve(k, cred)
+            placed[u] = k
+        return placed
+
+    def _list_schedule(self, snapshot: GraphSnapshot, max_creditos_semestre: int, priority: List[Any],
+                       pending: Optional[List[int]] = None) -> List[List[int]]:
+        """
+        Planificación por lista: cada semestre toma, en orden descendente de
+        (prioridad, créditos, índice), los cursos disponibles que aún caben.
+
+        Los disponibles se guardan en una CreditBucketFrontier: tomar siempre el
+        de mayor prioridad entre los que caben equivale a recorrerlos todos en
+        orden de prioridad saltando los que no caben, pero solo toca los cursos
+        elegidos (más una consulta por valor de créditos).
+
+        Args:
+            snapshot: Vista compacta del grafo (acíclico).
+            max_creditos_semestre: Límite de créditos por semestre.
+            priority: Prioridad comparable de cada índice de curso.
+            pending: Índices a planificar (por defecto, todos). Los demás cursos
+                se consideran aprobados y sus aristas no cuentan.
+
+        Returns:
+            Lista de semestres, cada uno una lista de índices de curso.
+        """
+        creditos = snapshot.credits
+        if pending is None:
+            grado_entrada = [len(p) for p in snapshot.pred]
+            pending = range(len(grado_entrada))
+        else:
+            # Solo cuentan los prerrequisitos que también están pendientes
+            en_plan = bytearray(len(snapshot))
+            for u in pending:
+                en_plan[u] = 1
+            grado_entrada = [0] * len(snapshot)
+            for u in pending:
+                grado_entrada[u] = sum(en_plan[p] for p in snapshot.pred[u])
+
+        # Inicializar frontera de disponibles
+        disponibles = CreditBucketFrontier()
+        for u in pending:
+            if grado_entrada[u] == 0:
+                # Usamos tupla (prioridad, créditos, índice)
+                disponibles.push((priority[u], creditos[u], u))
+
+        semestres: List[List[int]] = []
+        pendientes = len(pending)
 
-        # Paso 4: Asignación semestral
         while pendientes > 0:
             sem_actual: List[int] = []
-            suma_cred = 0
-            no_caben: List[Tuple[int,int,int]] = []
-
-            while not disponibles.is_empty():
-                pri, cred, u = disponibles.pop()
-                if suma_cred + cred <= max_creditos_semestre:
-                    sem_actual.append(u)
-                    suma_cred += cred
-                    completados[u] = True
-                    pendientes -= 1
-                else:
-                    no_caben.append((pri, cred, u))
+            restante = max_creditos_semestre
 
-            # Reinsertar los que no cupieron
-            for item in no_caben:
-                disponibles.push(item)
+            while True:
+                item = disponibles.pop_fitting(restante)
+                if item is None:
+                    break
+                _, cred, u = item
+                sem_actual.append(u)
+                restante -= cred
+                pendientes -= 1
 
-            semestres[semestre_idx] = sem_actual
-            semestre_idx += 1
+            semestres.append(sem_actual)
 
             # Actualizar sucesores
             for u in sem_actual:
-                for v in courses_graph.get_neighbors(u):
+                for v in snapshot.succ[u]:
                     grado_entrada[v] -= 1
-                    if grado_entrada[v] == 0 and not completados[v]:
-                        disponibles.push((max_credits[v], creditos[v], v))
+                    if grado_entrada[v] == 0:
+                        disponibles.push((priority[v], creditos[v], v))
 
         return semestres
 
+    def exact_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, time_budget: float = 2.0) -> Dict[str, Any]:
+        """
+        Busca un plan con el mínimo número de semestres mediante ramificación y poda.
+
+        Cada nivel del árbol de búsqueda decide los cursos de un semestre. Se parte
+        del plan de random_schedule como mejor solución conocida y se poda con:
+        - Cota inferior: semestres usados + max(cadena de prerrequisitos más larga
+          entre los cursos pendientes, créditos pendientes / tope).
+        - Dominancia: solo se consideran semestres maximales (a los que no cabe
+          ningún curso disponible más).
+        - Memoización: un conjunto de cursos completados ya alcanzado con igual o
+          menor número de semestres no se vuelve a explorar.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            time_budget: Tiempo máximo de búsqueda en segundos.
+
+        Returns:
+            Diccionario con el mejor plan ("schedule"), su número de semestres, la
+            cota inferior demostrada ("lower_bound"), la diferencia entre ambos
+            ("gap") y si la búsqueda terminó demostrando optimalidad ("optimal").
+        """
+        deadline = time.perf_counter() + time_budget
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+
+        n = len(snapshot)
+        credits = snapshot.credits
+        height = SemesterBounds.of(snapshot).height
+        pred_mask = [0] * n
+        for v in range(n):
+            for u in snapshot.pred[v]:
+                pred_mask[v] |= 1 << u
+        # Candidatos más urgentes primero: cadena más larga, luego más créditos
+        def urgency(u: int) -> Tuple[int, int, int]:
+            return (-height[u], -credits[u], u)
+
+        incumbent = self.random_schedule(max_creditos_semestre, courses_graph)
+        best = {"semesters": len(incumbent), "plan": [[snapshot.index[c] for c in incumbent[k]] for k in sorted(incumbent)]}
+
+        def remaining_bound(available: List[int], remaining_credits: int) -> int:
+            longest = max((height[u] for u in available), default=0)
+            return max(longest, -(-remaining_credits // max_creditos_semestre))
+
+        all_courses = (1 << n) - 1
+        root_available = sorted((u for u in range(n) if pred_mask[u] == 0), key=urgency)
+        bounds = SemesterBounds.of(snapshot)
+        root_bound = max(remaining_bound(root_available, sum(credits)),
+                         bounds.lower_bound(max_creditos_semestre)["lower_bound"],
+                         max(bounds.earliest(max_creditos_semestre), default=0))
+        visited: Dict[int, int] = {}
+        path: List[List[int]] = []
+        state = {"nodes": 0, "timed_out": False}
+
+        def open_node(completed: int, available: List[int], remaining_credits: int) -> Optional[List[Any]]:
+            """
+            Evalúa el nodo alcanzado con `path` y retorna su marco de búsqueda,
+            o None si es una solución completa o se poda.
+            """
+            if completed == all_courses:
+                if len(path) < best["semesters"]:
+                    best["semesters"] = len(path)
+                    best["plan"] = [list(semester) for semester in path]
+                return None
+            if len(path) + remaining_bound(available, remaining_credits) >= best["semesters"]:
+                return None
+            if visited.get(completed, n + 1) <= len(path):
+                return None
+            visited[completed] = len(path)
+            return [self._maximal_semesters(available, credits, max_creditos_semestre),
+                    completed, available, remaining_credits]
+
+        # Búsqueda en profundidad con pila explícita (un marco por semestre:
+        # los planes pueden tener cientos de semestres). Cada marco guarda
+        # [generador de semestres, completados, disponibles, créditos pendientes].
+        stack: List[List[Any]] = []
+        if best["semesters"] > root_bound:
+            root = open_node(0, root_available, sum(credits))
+            if root is not None:
+                stack.append(root)
+        while stack and best["semesters"] > root_bound:
+            generator, completed, available, remaining_credits = stack[-1]
+            semester = next(generator, None)
+            if semester is None:
+                stack.pop()
+                if stack:
+                    path.pop()
+                continue
+            state["nodes"] += 1
+            if state["nodes"] % 256 == 0 and time.perf_counter() > deadline:
+                state["timed_out"] = True
+                break
+            done = completed
+            for u in semester:
+                done |= 1 << u
+            taken = set(semester)
+            next_available = [u for u in available if u not in taken]
+            next_available.extend({v for u in semester for v in snapshot.succ[u] if pred_mask[v] & done == pred_mask[v]})
+            next_available.sort(key=urgency)
+            path.append(semester)
+            child = open_node(done, next_available, remaining_credits - sum(credits[u] for u in semester))
+            if child is None:
+                path.pop()
+            else:
+                stack.append(child)
+
+        optimal = not state["timed_out"]
+        lower_bound = best["semesters"] if optimal else root_bound
+        schedule = {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(best["plan"])}
+        return {
+            "schedule": schedule,
+            "semesters": best["semesters"],
+            "lower_bound": lower_bound,
+            "gap": best["semesters"] - lower_bound,
+            "optimal": optimal,
+            "explored_nodes": state["nodes"]
+        }
+
+    def iter_alternatives(self, max_creditos_semestre: int, courses_graph: CoursesGraph,
+                          time_budget: Optional[float] = None) -> Iterator[Dict[int, List[int]]]:
+        """
+        Genera, de forma perezosa, planes válidos distintos con el mejor número
+        de semestres conocido.
+
+        El primer plan entregado es el de exact_schedule, con una fracción
+        pequeña del tiempo disponible (a lo sumo 0.5 s): nunca es peor que
+        random_schedule y suele ser óptimo, y garantiza al menos un plan aunque
+        la búsqueda posterior no encuentre otro a tiempo. Su número de
+        semestres es el objetivo. Luego se hace una búsqueda en profundidad
+        semestre a semestre (con pila explícita, sin recursión) sobre semestres
+        maximales, con los disponibles en el orden de prioridad de
+        random_schedule, y solo se entregan planes distintos del primero con
+        exactamente ese número de semestres. Se poda con
+        la cota de cadena más larga y créditos pendientes. Si la búsqueda
+        encuentra un plan más corto (el objetivo no estaba demostrado), se
+        reinicia con el nuevo objetivo: los planes siguientes son más cortos
+        que los ya entregados. Ruptura de simetría: cursos gemelos (mismos
+        prerrequisitos, mismos dependientes y mismos créditos) son
+        intercambiables, así que solo se acepta la forma canónica en la que,
+        dentro de cada grupo de gemelos, se toman primero los de mayor índice.
+        Quien consume el generador puede detenerse cuando quiera.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            time_budget: Tiempo máximo de búsqueda en segundos (None = sin límite).
+
+        Yields:
+            Planes (semestre 1-based -> lista de IDs) distintos entre sí.
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        critical = snapshot.critical_credits()
+        credits = snapshot.credits
+        height = SemesterBounds.of(snapshot).height
+        seed_budget = 0.5 if time_budget is None else min(0.5, time_budget / 20)
+        seed = self.exact_schedule(max_creditos_semestre, courses_graph, seed_budget)
+        target = seed["semesters"]
+        first = {k: sorted(courses) for k, courses in seed["schedule"].items()}
+        yield first
+
+        # Siguiente gemelo (mayor índice) de cada curso, o -1
+        next_twin = [-1] * len(snapshot)
+        for twins in snapshot.twin_groups():
+            for a, b in zip(twins, twins[1:]):
+                next_twin[a] = b
+
+        def key(u: int) -> Tuple[Any, int, int]:
+            return (critical[u], credits[u], u)
+
+        taken = bytearray(len(snapshot))
+        grado_entrada = [len(p) for p in snapshot.pred]
+        root = sorted((u for u in range(len(snapshot)) if grado_entrada[u] == 0), key=key, reverse=True)
+
+        def canonical(semester: List[int]) -> bool:
+            chosen = set(semester)
+            return all(next_twin[u] == -1 or taken[next_twin[u]] or next_twin[u] in chosen for u in semester)
+
+        def bound(available: List[int], remaining_credits: int) -> int:
+            longest = max((height[u] for u in available), default=0)
+            return max(longest, -(-remaining_credits // max_creditos_semestre))
+
+        # Cada marco: [generador de semestres, disponibles, créditos pendientes, semestre elegido]
+        def root_stack() -> List[List[Any]]:
+            return [[self._maximal_semesters(root, credits, max_creditos_semestre), root, sum(credits), None]]
+
+        stack = root_stack()
+        path: List[List[int]] = []
+        pendientes = len(snapshot)
+        explored = 0
+        while stack:
+            frame = stack[-1]
+            if frame[3] is not None:
+                # Deshacer el semestre elegido antes en este marco
+                for u in frame[3]:
+                    taken[u] = 0
+                    for v in snapshot.succ[u]:
+                        grado_entrada[v] += 1
+                pendientes += len(frame[3])
+                path.pop()
+                frame[3] = None
+
+            explored += 1
+            if deadline is not None and explored % 256 == 0 and time.perf_counter() > deadline:
+                return
+            semester = next(frame[0], None)
+            if semester is None:
+                stack.pop()
+                continue
+            if not canonical(semester):
+                continue
+
+            nuevos: List[int] = []
+            for u in semester:
+                taken[u] = 1
+                for v in snapshot.succ[u]:
+                    grado_entrada[v] -= 1
+                    if grado_entrada[v] == 0:
+                        nuevos.append(v)
+            pendientes -= len(semester)
+            path.append(semester)
+            frame[3] = semester
+
+            if pendientes == 0:
+                if len(path) < target:
+                    # Plan más corto que el objetivo: reiniciar la búsqueda con él
+                    # (el plan se vuelve a encontrar y se entrega en la nueva pasada)
+                    target = len(path)
+                    while stack:
+                        chosen = stack.pop()[3]
+                        for u in chosen or ():
+                            taken[u] = 0
+                            for v in snapshot.succ[u]:
+                                grado_entrada[v] += 1
+                    path.clear()
+                    pendientes = len(snapshot)
+                    stack = root_stack()
+                    continue
+                plan = {k + 1: sorted(snapshot.ids[u] for u in courses) for k, courses in enumerate(path)}
+                if plan != first:
+                    yield plan
+                continue
+            available = sorted([u for u in frame[1] if not taken[u]] + nuevos, key=key, reverse=True)
+            remaining = frame[2] - sum(credits[u] for u in semester)
+            if len(path) + bound(available, remaining) > target:
+                continue
+            stack.append([self._maximal_semesters(available, credits, max_creditos_semestre), available, remaining, None])
+
+    def _maximal_semesters(self, available: List[int], credits: List[int], max_creditos_semestre: int) -> Iterator[List[int]]:
+        """
+        Genera los subconjuntos maximales de `available` que caben en el tope de
+        créditos (a los que no se puede añadir ningún otro curso disponible).
+        Basta con considerar estos semestres: adelantar un curso disponible que
+        cabe nunca empeora un plan.
+        """
+        INCLUDE, SKIP, UNDO = 0, 1, 2
+        chosen: List[int] = []
+        # Búsqueda con pila explícita (la lista de disponibles puede ser muy larga):
+        # (posición, créditos libres, menor crédito omitido, paso)
+        stack = [(0, max_creditos_semestre, max_creditos_semestre + 1, INCLUDE)]
+        while stack:
+            i, room, min_skipped, step = stack.pop()
+            if step == UNDO:
+                chosen.pop()
+                continue
+            if i == len(available):
+                if min_skipped > room:
+                    yield list(chosen)
+                continue
+            u = available[i]
+            if step == INCLUDE:
+                stack.append((i, room, min_skipped, SKIP))
+                if credits[u] <= room:
+                    chosen.append(u)
+                    stack.append((i, room, min_skipped, UNDO))
+                    stack.append((i + 1, room - credits[u], min_skipped, INCLUDE))
+            else:
+                stack.append((i + 1, room, min(min_skipped, credits[u]), INCLUDE))
+
+    def beam_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, width: int = 4, branching: int = 3,
+                      expand_many: Optional[Callable[[List[Tuple]], List[List[Tuple]]]] = None) -> Dict[int, List[int]]:
+        """
+        Búsqueda en haz semestre a semestre: en cada frontera de semestre se
+        conservan los `width` planes parciales más prometedores.
+
+        Cada plan parcial se extiende con sus primeros `branching` semestres
+        maximales (en el orden de prioridad de random_schedule, así que el
+        primero es el semestre voraz). Los hijos se ordenan por la cota
+        inferior de semestres totales (usados + max(cadena pendiente más
+        larga, créditos pendientes / tope)) y luego por créditos pendientes.
+        Dos planes parciales con el mismo conjunto de cursos completados son
+        equivalentes hacia adelante, así que solo se conserva uno (el conjunto
+        es un bitset, hashable). El plan voraz compite al final, por lo que el
+        resultado nunca es peor que el de random_schedule.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            width: Número de planes parciales que se conservan por semestre.
+            branching: Semestres candidatos que se generan por plan parcial.
+            expand_many: Función que expande una lista de estados del haz (ver
+                _beam_expand). Permite repartir la expansión entre procesos;
+                por defecto se expande en este proceso.
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        critical = courses_graph.snapshot().critical_credits()
+        height = SemesterBounds.of(snapshot).height
+        credits = snapshot.credits
+        greedy = self._list_schedule(snapshot, max_creditos_semestre, critical)
+        if expand_many is None:
+            def expand_many(states: List[Tuple]) -> List[List[Tuple]]:
+                return [self._beam_expand(snapshot, critical, max_creditos_semestre, branching, state) for state in states]
+
+        all_courses = (1 << len(snapshot)) - 1
+        root = tuple(sorted((u for u in range(len(snapshot)) if not snapshot.pred[u]),
+                            key=lambda u: (critical[u], credits[u], u), reverse=True))
+        # Haz: estados (completados, disponibles, créditos pendientes) y su camino
+        # como lista enlazada (semestre, camino del padre)
+        beam: List[Tuple[Tuple, Any]] = [((0, root, sum(credits)), None)]
+
+        for level in range(1, len(greedy)):
+            expansions = expand_many([state for state, _ in beam])
+            best: Dict[int, Tuple] = {}
+            for (_, path), children in zip(beam, expansions):
+                for semester, done, available, remaining in children:
+                    if done == all_courses:
+                        plan: List[List[int]] = [semester]
+                        while path is not None:
+                            plan.append(path[0])
+                            path = path[1]
+                        return {k + 1: [snapshot.ids[u] for u in courses] for k, courses in enumerate(reversed(plan))}
+                    longest = max((height[u] for u in available), default=0)
+                    score = (level + max(longest, -(-remaining // max_creditos_semestre)), remaining)
+                    # Solo sirven los que aún pueden mejorar el plan voraz
+                    if score[0] >= len(greedy):
+                        continue
+                    if done not in best or score < best[done][0]:
+                        best[done] = (score, (done, available, remaining), (semester, path))
+            if not best:
+                break
+            ranked = sorted(best.values(), key=lambda child: child[0])[:width]
+            beam = [(state, path) for _, state, path in ranked]
+
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(greedy)}
+
+    def _beam_expand(self, snapshot: GraphSnapshot, critical: List[int], max_creditos_semestre: int, branching: int,
+                     state: Tuple[int, Tuple[int, ...], int]) -> List[Tuple[List[int], int, Tuple[int, ...], int]]:
+        """
+        Genera los hijos de un estado del haz: de los primeros semestres
+        maximales (16 por cada hijo pedido) se conservan los `branching` que
+        dejan la menor cota de semestres pendientes. Trabaja solo sobre la
+        vista compacta, por lo que puede ejecutarse en otro proceso.
+
+        Returns:
+            Lista de (semestre, completados, disponibles ordenados por
+            prioridad, créditos pendientes)
+        """
+        completed, available, remaining = state
+        credits = snapshot.credits
+        height = SemesterBounds.of(snapshot).height
+        pred_mask = snapshot.memo('pred_mask', self._pred_masks)
+        children = []
+        candidates = islice(self._maximal_semesters(list(available), credits, max_creditos_semestre), 16 * branching)
+        for semester in candidates:
+            done = completed
+            for u in semester:
+                done |= 1 << u
+            taken = set(semester)
+            unlocked = {v for u in semester for v in snapshot.succ[u] if pred_mask[v] & done == pred_mask[v]}
+            next_available = [u for u in available if u not in taken]
+            next_available.extend(unlocked)
+            next_available.sort(key=lambda u: (critical[u], credits[u], u), reverse=True)
+            left = remaining - sum(credits[u] for u in semester)
+            longest = max((height[u] for u in next_available), default=0)
+            bound = (max(longest, -(-left // max_creditos_semestre)), left)
+            children.append((bound, semester, done, tuple(next_available), left))
+        # Orden estable: ante empates gana el primero (el voraz)
+        children.sort(key=lambda child: child[0])
+        return [child[1:] for child in children[:branching]]
+
+    @staticmethod
+    def _pred_masks(snapshot: GraphSnapshot) -> List[int]:
+        """
+        Returns:
+            Bitset de prerrequisitos directos de cada índice de curso
+        """
+        masks = [0] * len(snapshot)
+        for v in range(len(snapshot)):
+            for u in snapshot.pred[v]:
+                masks[v] |= 1 << u
+        return masks
+
+    def component_schedule(self, max_creditos_semestre: int, courses_graph: CoursesGraph, max_component_size: int = 25) -> Dict[int, List[int]]:
+        """
+        Planifica por componentes independientes del grafo de prerrequisitos.
+
+        Las componentes de hasta `max_component_size` cursos se resuelven de forma
+        exacta con programación dinámica sobre bitmasks de cursos completados; las
+        más grandes usan la prioridad de camino crítico de random_schedule. Si los
+        planes por componente caben juntos semestre a semestre se unen tal cual;
+        si no, se combinan con una planificación por lista cuya prioridad es el
+        número de semestres que a cada curso le quedan por delante en su plan.
+
+        Args:
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            max_component_size: Tamaño máximo de componente a resolver de forma exacta.
+
+        Returns:
+            Dict donde la clave es el número de semestre (1-based) y el valor es la lista de IDs de cursos.
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        height = SemesterBounds.of(snapshot).height
+        critical = courses_graph.snapshot().critical_credits()
+
+        components = DisjointSets(len(snapshot))
+        for u in range(len(snapshot)):
+            for v in snapshot.succ[u]:
+                components.union(u, v)
+
+        # Semestres que le quedan a cada curso (incluido el suyo) en el plan de su componente
+        remaining = list(height)
+        merged: List[List[int]] = []
+        for members in components.get_all_sets().values():
+            if len(members) > max_component_size:
+                continue
+            plan = self._solve_component(snapshot, members, max_creditos_semestre)
+            for k, semester in enumerate(plan):
+                if k == len(merged):
+                    merged.append([])
+                merged[k].extend(semester)
+                for u in semester:
+                    remaining[u] = len(plan) - k
+
+        credits = snapshot.credits
+        all_exact = len(snapshot) == sum(len(semester) for semester in merged)
+        if all_exact and all(sum(credits[u] for u in semester) <= max_creditos_semestre for semester in merged):
+            plan = [sorted(semester, key=lambda u: (remaining[u], critical[u], u), reverse=True) for semester in merged]
+        else:
+            priority = [(remaining[u], critical[u]) for u in range(len(snapshot))]
+            plan = self._list_schedule(snapshot, max_creditos_semestre, priority)
+        return {k + 1: [snapshot.ids[u] for u in semester] for k, semester in enumerate(plan)}
+
+    def _solve_component(self, snapshot: GraphSnapshot, members: List[int], max_creditos_semestre: int) -> List[List[int]]:
+        """
+        Resuelve de forma exacta una componente pequeña con programación dinámica
+        memoizada sobre el bitmask (int de Python) de cursos completados.
+
+        Returns:
+            Plan óptimo de la componente como lista de semestres (índices globales).
+        """
+        local = {u: i for i, u in enumerate(members)}
+        credits = [snapshot.credits[u] for u in members]
+        pred_mask = [0] * len(members)
+        for i, u in enumerate(members):
+            for p in snapshot.pred[u]:
+                pred_mask[i] |= 1 << local[p]
+        height = SemesterBounds.of(snapshot).height
+        full = (1 << len(members)) - 1
+        memo: Dict[int, Tuple[int, int]] = {full: (0, 0)}
+
+        def solve(done: int) -> int:
+            if done in memo:
+                return memo[done][0]
+            available = [i for i in range(len(members))
+                         if not (done >> i) & 1 and pred_mask[i] & done == pred_mask[i]]
+            remaining_credits = sum(credits[i] for i in range(len(members)) if not (done >> i) & 1)
+            bound = max(max(height[members[i]] for i in available),
+                        -(-remaining_credits // max_creditos_semestre))
+            best, best_choice = len(members) + 1, 0
+            for semester in self._maximal_semesters(available, credits, max_creditos_semestre):
+                chosen = 0
+                for i in semester:
+                    chosen |= 1 << i
+                total = 1 + solve(done | chosen)
+                if total < best:
+                    best, best_choice = total, chosen
+                    if best == bound:
+                        break
+            memo[done] = (best, best_choice)
+            return best
+
+        solve(0)
+        plan: List[List[int]] = []
+        done = 0
+        while done != full:
+            chosen = memo[done][1]
+            plan.append([members[i] for i in range(len(members)) if (chosen >> i) & 1])
+            done |= chosen
+        return plan
+
+    def improve_schedule(self, schedule: Dict[int, List[int]], max_creditos_semestre: int, courses_graph: CoursesGraph,
+                         iterations: int = 20000, seed: Optional[int] = None, temperature: float = 2.0) -> Dict[int, List[int]]:
+        """
+        Mejora un plan existente (generado o del usuario) con recocido simulado.
+
+        Cada paso mueve un curso a otro semestre dentro de la ventana que dejan sus
+        prerrequisitos y dependientes; si el semestre destino se pasa del tope se
+        intenta intercambiarlo con un curso de ese semestre. El costo penaliza
+        primero las violaciones (prerrequisitos y créditos), luego el número de
+        semestres y por último la carga del último semestre, lo que empuja a
+        vaciarlo. Cada movimiento se evalúa en O(grado) con PlanState, sin
+        revalidar el plan completo.
+
+        Args:
+            schedule: Plan inicial (semestre -> lista de IDs), con cada curso una vez.
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+            iterations: Número de movimientos a intentar.
+            seed: Semilla del generador aleatorio.
+            temperature: Temperatura inicial; decrece linealmente hasta 0.
+
+        Returns:
+            Mejor plan encontrado (semestre 1-based -> lista de IDs).
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        state = PlanState.from_schedule(snapshot, max_creditos_semestre, schedule)
+        credits = snapshot.credits
+        rng = random.Random(seed)
+
+        # Cualquier violación pesa más que cualquier número de semestres
+        penalty = (max_creditos_semestre + 1) * (len(snapshot) + 2)
+
+        def cost() -> int:
+            return (penalty * (state.violations + state.overload)
+                    + (max_creditos_semestre + 1) * state.last + state.load[state.last])
+
+        current = best_cost = cost()
+        best = list(state.semester)
+        for step in range(iterations if len(snapshot) else 0):
+            # La mitad de las veces se intenta sacar un curso del último semestre
+            if rng.random() < 0.5:
+                u = rng.choice(state.members[state.last])
+            else:
+                u = rng.randrange(len(snapshot))
+            source = state.semester[u]
+            window = state.window(u)
+            if not window:
+                window = range(1, state.last + 2)
+            # A lo sumo un semestre nuevo después del último
+            target = rng.randint(window.start, min(window.stop - 1, state.last + 1))
+            if target == source:
+                continue
+
+            state.move(u, target)
+            partner = None
+            if state.load[target] > max_creditos_semestre and len(state.members[target]) > 1:
+                w = rng.choice(state.members[target])
+                if w != u and source in state.window(w):
+                    partner = w
+                    state.move(w, source)
+
+            candidate = cost()
+            delta = candidate - current
+            heat = temperature * (1 - step / iterations)
+            if delta <= 0 or (heat > 0 and rng.random() < math.exp(-delta / heat)):
+                current = candidate
+                if candidate < best_cost:
+                    best_cost = candidate
+                    best = list(state.semester)
+            else:
+                if partner is not None:
+                    state.move(partner, target)
+                state.move(u, source)
+
+        improved = PlanState(snapshot, max_creditos_semestre, best)
+        return {k + 1: [snapshot.ids[u] for u in sorted(semester)] for k, semester in enumerate(improved.to_plan())}
+
+    def repair_schedule(self, schedule: Dict[int, List[int]], max_creditos_semestre: int,
+                        courses_graph: CoursesGraph) -> Dict[str, Any]:
+        """
+        Repara un plan inválido moviendo la menor cantidad posible de cursos.
+
+        Una pasada O(V + E) marca como pendientes los cursos con algún
+        prerrequisito en su mismo semestre o después, los cursos que faltan y
+        los semestres que exceden el tope. Luego se procesan en orden de
+        semestre (montículo):
+        - Si un curso tiene prerrequisitos en su semestre o después, primero se
+          intenta adelantarlos a un semestre anterior con espacio (no afecta a
+          nadie más). Si no se puede, el curso va al siguiente semestre de su
+          último prerrequisito o, si no hay créditos libres ahí, al semestre
+          con espacio más cercano (uno anterior que sus prerrequisitos
+          permitan o el primero posterior).
+        - Un semestre excedido saca primero sus cursos de menor camino crítico
+          (los que menos dependientes arrastran) hasta quedar dentro del tope.
+        Cuando un curso se mueve a un semestre posterior, solo sus dependientes
+        que quedan antes o en el mismo semestre pasan a estar pendientes. Así
+        el resto del plan no se toca y el trabajo es proporcional a la parte
+        afectada. La búsqueda de semestres con espacio usa CapacitySegmentTree.
+
+        Los IDs que no existen en el grafo se descartan y los cursos del grafo
+        que faltan en el plan se agregan en el primer semestre con espacio.
+
+        Args:
+            schedule: Plan a reparar (semestre -> lista de IDs).
+            max_creditos_semestre: Límite de créditos por semestre.
+            courses_graph: Instancia de CoursesGraph con los cursos y prerrequisitos.
+
+        Returns:
+            Diccionario con el plan reparado ("schedule", semestres 1-based en
+            el orden del plan original), los cursos movidos ("moved": ID,
+            semestre original y nuevo), los agregados ("added") y los
+            descartados ("removed")
+        """
+        snapshot = courses_graph.snapshot()
+        snapshot.require_acyclic()
+        self._check_course_credits(snapshot, max_creditos_semestre)
+        credits = snapshot.credits
+        pred = snapshot.pred
+        critical = courses_graph.snapshot().critical_credits()
+
+        # Semestre pedido (posición 1..K en el plan; 0 = falta en el plan)
+        requested = [0] * len(snapshot)
+        removed: List[int] = []
+        members: List[List[int]] = [[] for _ in range(len(schedule) + 1)]
+        loads = [0] * len(schedule)
+        for k, key in enumerate(sorted(schedule), start=1):
+            for course_id in schedule[key]:
+                u = snapshot.index.get(course_id)
+                if u is None:
+                    removed.append(course_id)
+                elif not requested[u]:
+                    requested[u] = k
+                    members[k].append(u)
+                    loads[k - 1] += credits[u]
+        placed = list(requested)
+        capacity = CapacitySegmentTree.from_loads(max_creditos_semestre, loads)
+
+        # Eventos (semestre, tipo, dato); en un mismo semestre primero los cursos
+        COURSE, SEMESTER = 0, 1
+        eventos = MaxHeap()
+        for u in range(len(snapshot)):
+            if not placed[u]:
+                if all(placed[p] for p in pred[u]):
+                    eventos.push((-(1 + max((placed[p] for p in pred[u]), default=0)), -COURSE, -u))
+            elif any(placed[p] >= placed[u] or not placed[p] for p in pred[u]):
+                eventos.push((-placed[u], -COURSE, -u))
+        for k, load in enumerate(loads, start=1):
+            if load > max_creditos_semestre:
+                eventos.push((-k, -SEMESTER, -k))
+
+        def ready_of(u: int) -> int:
+            return 1 + max((placed[p] for p in pred[u]), default=0)
+
+        def pull_prereqs(u: int) -> bool:
+            """Adelanta los prerrequisitos de u que están en su semestre o después."""
+            pulled: List[Tuple[int, int]] = []
+            for p in pred[u]:
+                if placed[p] < placed[u]:
+                    continue
+                slot = capacity.find_last(placed[u] - 1, credits[p]) + 1
+                if not all(placed[q] for q in pred[p]) or slot < ready_of(p):
+                    # Deshacer lo adelantado: el curso se moverá en su lugar
+                    # (release negativo: el semestre original puede estar excedido)
+                    for q, original in reversed(pulled):
+                        capacity.release(placed[q] - 1, credits[q])
+                        capacity.release(original - 1, -credits[q])
+                        placed[q] = original
+                    return False
+                pulled.append((p, placed[p]))
+                capacity.release(placed[p] - 1, credits[p])
+                capacity.reserve(slot - 1, credits[p])
+                placed[p] = slot
+            return True
+
+        def relocate(u: int, target: int, ready: int) -> None:
+            """Mueve u al semestre con espacio más cercano a target (>= ready)."""
+            cred = credits[u]
+            if placed[u]:
+                capacity.release(placed[u] - 1, cred)
+            # Semestres 1-based sobre el árbol 0-based
+            k = capacity.find_first(target - 1, cred) + 1
+            if k != target:
+                earlier = capacity.find_last(target - 1, cred) + 1
+                if earlier >= ready and target - earlier <= k - target:
+                    k = earlier
+            capacity.reserve(k - 1, cred)
+            placed[u] = k
+            # Los dependientes que quedaron antes (o sin ubicar) pasan a estar pendientes
+            for v in snapshot.succ[u]:
+                if placed[v] <= k:
+                    eventos.push((-(k + 1), -COURSE, -v))
+
+        while not eventos.is_empty():
+            _, neg_kind, neg_data = eventos.pop()
+            if -neg_kind == COURSE:
+                u = -neg_data
+                if not all(placed[p] for p in pred[u]):
+                    continue
+                ready = ready_of(u)
+                if placed[u] >= ready:
+                    continue
+                if placed[u] and pull_prereqs(u):
+                    continue
+                relocate(u, max(ready, requested[u]), ready)
+            else:
+                k = -neg_data
+                # Sacar los cursos de menor camino crítico hasta cumplir el tope
+                for u in sorted(members[k], key=critical.__getitem__):
+                    if capacity.remaining(k - 1) >= 0:
+                        break
+                    if placed[u] == k:
+                        relocate(u, k + 1, ready_of(u))
+
+        semestres: Dict[int, List[int]] = {}
+        for u in range(len(snapshot)):
+            semestres.setdefault(placed[u], []).append(snapshot.ids[u])
+        return {
+            "schedule": dict(sorted(semestres.items())),
+            "moved": [{"course_id": snapshot.ids[u], "from": requested[u], "to": placed[u]}
+                      for u in range(len(snapshot)) if requested[u] and requested[u] != placed[u]],
+            "added": [snapshot.ids[u] for u in range(len(snapshot)) if not requested[u]],
+            "removed": removed
+        }
+
+    def _check_course_credits(self, snapshot: GraphSnapshot, max_creditos_semestre: int,
+                              pending: Optional[List[int]] = None) -> None:
+        """
+        Raises:
+            ValueError: Si algún curso (de `pending`, o de todo el grafo) no cabe
+                por sí solo en un semestre
+        """
+        for u in range(len(snapshot)) if pending is None else pending:
+            course_credits = snapshot.credits[u]
+            if course_credits > max_creditos_semestre:
+                raise ValueError(f"El curso {snapshot.ids[u]} tiene {course_credits} créditos y excede el límite de {max_creditos_semestre}")
@@ -0,0 +1,310 @@
+import hashlib
+from typing import List, Dict, Tuple, Any, Callable
+from graduacion_unal.structures.queue import Queue
+
+
+class GraphSnapshot:
+    """
+    Vista compacta e inmutable de un CoursesGraph basada en índices enteros.
+
+    Los cursos se numeran de 0 a n-1 en orden ascendente de ID, de modo que
+    comparar índices equivale a comparar IDs. Todas las estructuras son listas
+    planas, lo que hace que la vista sea barata de recorrer y de serializar
+    (pickle) hacia otros procesos.
+
+    Atributos:
+        version: Versión del grafo a partir de la cual se construyó la vista.
+        ids: Lista de IDs de curso, indexada por índice.
+        index: Diccionario ID de curso -> índice.
+        credits: Créditos de cada curso, indexados por índice.
+        succ: Sucesores (cursos dependientes) de cada índice.
+        pred: Predecesores (prerrequisitos) de cada índice.
+        order: Orden topológico de los índices (parcial si hay ciclos).
+        acyclic: True si el orden topológico cubre todos los cursos.
+    """
+
+    __slots__ = ('version', 'ids', 'index', 'credits', 'succ', 'pred', 'order', 'acyclic', '_cache')
+
+    def __init__(self, version: int, ids: List[int], credits: List[int],
+                 succ: List[List[int]], pred: List[List[int]], order: List[int]) -> None:
+        self.version = version
+        self.ids = ids
+        self.index: Dict[int, int] = {cid: i for i, cid in enumerate(ids)}
+        self.credits = credits
+        self.succ = succ
+        self.pred = pred
+        self.order = order
+        self.acyclic = len(order) == len(ids)
+        self._cache: Dict[str, Any] = {}
+
+    @classmethod
+    def from_graph(cls, graph) -> 'GraphSnapshot':
+        """
+        Construye la vista a partir de un CoursesGraph en O(V log V + E).
+
+        Args:
+            graph: Instancia de CoursesGraph
+
+        Returns:
+            Nueva instancia de GraphSnapshot
+        """
+        courses = sorted(graph.courses_map.values(), key=lambda c: c.id)
+        ids = [course.id for course in courses]
+        index = {cid: i for i, cid in enumerate(ids)}
+        credits = [course.credits for course in courses]
+
+        succ: List[List[int]] = [[] for _ in ids]
+        pred: List[List[int]] = [[] for _ in ids]
+        for course_id, neighbors in graph.adjacency_list.items():
+            u = index.get(course_id)
+            if u is None:
+                continue
+            for neighbor_id in neighbors:
+                v = index.get(neighbor_id)
+                if v is not None:
+                    succ[u].append(v)
+                    pred[v].append(u)
+
+        # Se reutiliza el orden topológico que el grafo mantiene incrementalmente
+        try:
+            order = [index[course_id] for course_id in graph.topological_order()]
+        except ValueError:
+            order = cls._kahn_order(succ, pred)
+        return cls(graph.version, ids, credits, succ, pred, order)
+
+    @staticmethod
+    def _kahn_order(succ: List[List[int]], pred: List[List[int]]) -> List[int]:
+        """
+        Orden topológico de Kahn (FIFO). Si hay ciclos, los cursos que forman
+        parte de ellos (o dependen de ellos) quedan fuera del orden.
+        """
+        in_degree = [len(p) for p in pred]
+        cola = Queue()
+        for u, deg in enumerate(in_degree):
+            if deg == 0:
+                cola.enqueue(u)
+
+        order: List[int] = []
+        while not cola.is_empty():
+            u = cola.dequeue()
+            order.append(u)
+            for v in succ[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    cola.enqueue(v)
+        return order
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Los datos derivados se recalculan en destino; solo viaja la estructura
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_cache'}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def without(self, u: int) -> 'GraphSnapshot':
+        """
+        Construye en O(V + E) la vista del grafo sin el curso u, como si se
+        hubiera eliminado con CoursesGraph.remove_node (sus dependientes dejan
+        de exigirlo). Los índices mayores que u se desplazan en uno, así que se
+        conserva el orden por ID y el orden topológico.
+
+        Args:
+            u: Índice del curso a excluir
+
+        Returns:
+            Nueva instancia de GraphSnapshot
+        """
+        def shift(v: int) -> int:
+            return v - 1 if v > u else v
+
+        keep = [w for w in range(len(self.ids)) if w != u]
+        return GraphSnapshot(
+            self.version,
+            [self.ids[w] for w in keep],
+            [self.credits[w] for w in keep],
+            [[shift(v) for v in self.succ[w] if v != u] for w in keep],
+            [[shift(v) for v in self.pred[w] if v != u] for w in keep],
+            [shift(w) for w in self.order if w != u]
+        )
+
+    def memo(self, key: str, factory: Callable[['GraphSnapshot'], Any]) -> Any:
+        """
+        Calcula (una sola vez por versión del grafo) un dato derivado de la vista.
+
+        Args:
+            key: Nombre del dato en la caché
+            factory: Función que recibe la vista y calcula el dato
+
+        Returns:
+            El dato calculado o el que ya estaba en la caché
+        """
+        if key not in self._cache:
+            self._cache[key] = factory(self)
+        return self._cache[key]
+
+    def require_acyclic(self) -> None:
+        """
+        Raises:
+            ValueError: Si el grafo tiene ciclos
+        """
+        if not self.acyclic:
+            raise ValueError("El grafo de prerrequisitos tiene ciclos")
+
+    def position(self) -> List[int]:
+        """
+        Returns:
+            Posición de cada índice dentro del orden topológico
+        """
+        if 'position' not in self._cache:
+            position = [0] * len(self.ids)
+            for pos, u in enumerate(self.order):
+                position[u] = pos
+            self._cache['position'] = position
+        return self._cache['position']
+
+    def descendants(self) -> List[int]:
+        """
+        Calcula, para cada curso, el conjunto de cursos que dependen de él
+        (directa o transitivamente) como bitset (int de Python).
+
+        Se recorre el orden topológico inverso, de modo que cada bitset se
+        obtiene con un OR de los bitsets de sus sucesores.
+
+        Returns:
+            Lista de bitsets indexada por índice de curso
+        """
+        if 'descendants' not in self._cache:
+            self.require_acyclic()
+            reach = [0] * len(self.ids)
+            for u in reversed(self.order):
+                bits = 0
+                for v in self.succ[u]:
+                    bits |= (1 << v) | reach[v]
+                reach[u] = bits
+            self._cache['descendants'] = reach
+        return self._cache['descendants']
+
+    def ancestors(self) -> List[int]:
+        """
+        Calcula, para cada curso, el conjunto de sus prerrequisitos directos o
+        transitivos como bitset (int de Python).
+
+        Returns:
+            Lista de bitsets indexada por índice de curso
+        """
+        if 'ancestors' not in self._cache:
+            self.require_acyclic()
+            reach = [0] * len(self.ids)
+            for v in self.order:
+                bits = 0
+                for u in self.pred[v]:
+                    bits |= (1 << u) | reach[u]
+                reach[v] = bits
+            self._cache['ancestors'] = reach
+        return self._cache['ancestors']
+
+    def critical_credits(self) -> List[int]:
+        """
+        Calcula, para cada curso, la máxima suma de créditos de un camino que
+        empieza en él (su camino crítico en créditos), en O(V + E) recorriendo
+        el orden topológico inverso.
+
+        Returns:
+            Lista de créditos críticos indexada por índice de curso
+        """
+        if 'critical_credits' not in self._cache:
+            self.require_acyclic()
+            result = [0] * len(self.ids)
+            for u in reversed(self.order):
+                result[u] = self.credits[u] + max((result[v] for v in self.succ[u]), default=0)
+            self._cache['critical_credits'] = result
+        return self._cache['critical_credits']
+
+    def twin_groups(self) -> List[List[int]]:
+        """
+        Agrupa los cursos intercambiables: mismos prerrequisitos, mismos
+        dependientes y mismos créditos. Solo se retornan grupos de dos o más.
+
+        Returns:
+            Lista de grupos de índices (cada grupo en orden ascendente)
+        """
+        if 'twin_groups' not in self._cache:
+            groups: Dict[Tuple, List[int]] = {}
+            for u in range(len(self.ids)):
+                key = (self.credits[u], tuple(sorted(self.pred[u])), tuple(sorted(self.succ[u])))
+                groups.setdefault(key, []).append(u)
+            self._cache['twin_groups'] = [group for group in groups.values() if len(group) > 1]
+        return self._cache['twin_groups']
+
+    def chain_counts(self) -> Tuple[List[int], List[int]]:
+        """
+        Cuenta las cadenas de prerrequisitos maximales (de un curso sin
+        prerrequisitos a uno sin dependientes) que pasan por cada curso.
+
+        Las cadenas que llegan a u se acumulan en orden topológico y las que
+        salen de u en orden inverso; las que pasan por u son el producto de
+        ambas. Costo O(V + E) operaciones sobre enteros de Python (los conteos
+        pueden crecer exponencialmente).
+
+        Returns:
+            Tupla (cadenas que terminan en cada curso, cadenas que empiezan en él)
+        """
+        if 'chain_counts' not in self._cache:
+            self.require_acyclic()
+            n = len(self.ids)
+            into = [0] * n
+            for v in self.order:
+                into[v] = sum(into[u] for u in self.pred[v]) or 1
+            out = [0] * n
+            for u in reversed(self.order):
+                out[u] = sum(out[v] for v in self.succ[u]) or 1
+            self._cache['chain_counts'] = (into, out)
+        return self._cache['chain_counts']
+
+    def redundant_edges(self) -> List[Tuple[int, int]]:
+        """
+        Detecta las aristas redundantes (u -> v tales que v es alcanzable desde
+        u por otro camino).
+
+        Para cada curso u se recorren sus sucesores en orden topológico: un
+        sucesor ya cubierto por los descendientes de un sucesor anterior es
+        redundante. Costo O(E * V / w) con w el tamaño de palabra.
+
+        Returns:
+            Lista de aristas redundantes como pares de índices (u, v)
+        """
+        if 'redundant_edges' not in self._cache:
+            reach = self.descendants()
+            position = self.position()
+            redundant: List[Tuple[int, int]] = []
+            for u in self.order:
+                covered = 0
+                for v in sorted(self.succ[u], key=position.__getitem__):
+                    if (covered >> v) & 1:
+                        redundant.append((u, v))
+                    else:
+                        covered |= reach[v]
+            self._cache['redundant_edges'] = redundant
+        return self._cache['redundant_edges']
+
+    def fingerprint(self) -> str:
+        """
+        Huella del contenido del grafo que afecta a la planificación: IDs,
+        créditos y prerrequisitos (no los nombres). Dos grafos con la misma
+        huella producen los mismos planes, aunque vengan de sesiones distintas.
+
+        Returns:
+            Hash SHA-256 en hexadecimal
+        """
+        if 'fingerprint' not in self._cache:
+            digest = hashlib.sha256()
+            for u, course_id in enumerate(self.ids):
+                prereqs = ",".join(str(self.ids[p]) for p in sorted(self.pred[u]))
+                digest.update(f"{course_id}:{self.credits[u]}:{prereqs};".encode())
+            self._cache['fingerprint'] = digest.hexdigest()
+        return self._cache['fingerprint']
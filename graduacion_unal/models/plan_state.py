@@ -0,0 +1,132 @@
+from typing import List, Dict
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+
+
+class PlanState:
+    """
+    Plan de semestres con sus agregados mantenidos incrementalmente.
+
+    Mover un curso de semestre actualiza en O(grado del curso) los créditos por
+    semestre, el exceso de créditos, los prerrequisitos violados y el último
+    semestre usado, sin volver a validar el plan completo.
+
+    Atributos:
+        snapshot: Vista compacta del grafo.
+        max_credits: Límite de créditos por semestre.
+        semester: Semestre (1-based) de cada índice de curso.
+        load: Créditos de cada semestre (posición 0 sin usar).
+        members: Índices de curso de cada semestre (posición 0 sin usar).
+        violations: Número de aristas prerrequisito -> curso con el prerrequisito
+            en el mismo semestre o en uno posterior.
+        overload: Suma de los créditos que exceden el tope en cada semestre.
+        last: Último semestre con cursos.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot, max_credits: int, semester: List[int]) -> None:
+        self.snapshot = snapshot
+        self.max_credits = max_credits
+        self.semester = list(semester)
+        size = max(self.semester, default=0) + 1
+        self.load: List[int] = [0] * size
+        self.members: List[List[int]] = [[] for _ in range(size)]
+        self._slot: List[int] = [0] * len(semester)
+        for u, k in enumerate(self.semester):
+            self._slot[u] = len(self.members[k])
+            self.members[k].append(u)
+            self.load[k] += snapshot.credits[u]
+
+        self.violations = sum(1 for v in range(len(snapshot)) for p in snapshot.pred[v]
+                              if self.semester[p] >= self.semester[v])
+        self.overload = sum(max(0, load - max_credits) for load in self.load)
+        self.last = size - 1
+        while self.last > 0 and not self.members[self.last]:
+            self.last -= 1
+
+    @classmethod
+    def from_schedule(cls, snapshot: GraphSnapshot, max_credits: int, schedule: Dict[int, List[int]]) -> 'PlanState':
+        """
+        Construye el estado a partir de un plan semestre -> lista de IDs. Los
+        semestres se renumeran 1..K en el orden de sus claves.
+
+        Raises:
+            ValueError: Si el plan no contiene cada curso del grafo exactamente una vez
+        """
+        semester = [0] * len(snapshot)
+        for k, key in enumerate(sorted(schedule), start=1):
+            for course_id in schedule[key]:
+                u = snapshot.index.get(course_id)
+                if u is None:
+                    raise ValueError(f"Curso {course_id} no encontrado en el grafo")
+                if semester[u]:
+                    raise ValueError(f"Curso {course_id} aparece más de una vez en el plan")
+                semester[u] = k
+        missing = [snapshot.ids[u] for u in range(len(snapshot)) if not semester[u]]
+        if missing:
+            raise ValueError(f"El plan no incluye los cursos: {missing}")
+        return cls(snapshot, max_credits, semester)
+
+    def course_violations(self, u: int) -> int:
+        """
+        Returns:
+            Número de aristas incidentes a u que violan el orden de prerrequisitos
+        """
+        k = self.semester[u]
+        return (sum(1 for p in self.snapshot.pred[u] if self.semester[p] >= k)
+                + sum(1 for s in self.snapshot.succ[u] if k >= self.semester[s]))
+
+    def window(self, u: int) -> range:
+        """
+        Returns:
+            Semestres en los que u respeta a sus prerrequisitos y dependientes
+            (sin considerar créditos); el límite superior sin dependientes es el
+            semestre siguiente al último usado
+        """
+        low = max((self.semester[p] for p in self.snapshot.pred[u]), default=0) + 1
+        high = min((self.semester[s] for s in self.snapshot.succ[u]), default=self.last + 2) - 1
+        return range(low, high + 1)
+
+    def move(self, u: int, target: int) -> None:
+        """
+        Mueve el curso u al semestre `target` (1-based) en O(grado de u).
+        """
+        source = self.semester[u]
+        if source == target:
+            return
+        credits = self.snapshot.credits[u]
+
+        self.violations -= self.course_violations(u)
+        self._excess_change(source, -credits)
+        self._excess_change(target, credits)
+
+        members = self.members[source]
+        moved = members[-1]
+        members[self._slot[u]] = moved
+        self._slot[moved] = self._slot[u]
+        members.pop()
+        self._slot[u] = len(self.members[target])
+        self.members[target].append(u)
+        self.semester[u] = target
+        self.violations += self.course_violations(u)
+
+        if target > self.last:
+            self.last = target
+        while self.last > 0 and not self.members[self.last]:
+            self.last -= 1
+
+    def _excess_change(self, k: int, delta: int) -> None:
+        while k >= len(self.load):
+            self.load.append(0)
+            self.members.append([])
+        before = max(0, self.load[k] - self.max_credits)
+        self.load[k] += delta
+        self.overload += max(0, self.load[k] - self.max_credits) - before
+
+    def is_valid(self) -> bool:
+        return self.violations == 0 and self.overload == 0
+
+    def to_plan(self) -> List[List[int]]:
+        """
+        Returns:
+            Lista de semestres no vacíos (índices de curso), en orden
+        """
+        return [list(members) for members in self.members[1:self.last + 1] if members]
@@ -0,0 +1,73 @@
+from typing import List, Dict, Any
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+from graduacion_unal.models.semester_bounds import SemesterBounds
+from graduacion_unal.models.courses_schedule import Schedule
+
+
+class RemovalImpact:
+    """
+    Efecto de eliminar un curso (como CoursesGraph.remove_node: sus
+    dependientes dejan de exigirlo) sobre la duración del plan.
+
+    Para cada curso se construye la vista del grafo sin él y se calculan:
+    - La cota inferior de semestres de SemesterBounds.lower_bound (cadena,
+      volumen de créditos y niveles), la misma que reportan los planes.
+    - El número de semestres de random_schedule sin el curso. Al quitarlo
+      solo cambian los créditos críticos de sus ancestros (bitset de
+      ancestros), que se recalculan en orden topológico inverso; el resto de
+      prioridades se reutiliza.
+
+    Todo depende solo de la vista compacta, así que cada curso puede
+    analizarse en un proceso distinto.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot, critical: List[int], max_credits: int) -> None:
+        snapshot.require_acyclic()
+        self.snapshot = snapshot
+        self.critical = critical
+        self.max_credits = max_credits
+        self._schedule = Schedule()
+        self.ancestors = snapshot.ancestors()
+        self.position = snapshot.position()
+
+        self.base_lower_bound = SemesterBounds.of(snapshot).lower_bound(max_credits)["lower_bound"]
+        self.base_semesters = len(self._schedule._list_schedule(snapshot, max_credits, critical))
+
+    def critical_without(self, u: int) -> List[int]:
+        """
+        Returns:
+            Créditos críticos de la vista sin el curso u (indexados como en
+            GraphSnapshot.without)
+        """
+        critical = list(self.critical)
+        members = []
+        bits = self.ancestors[u]
+        while bits:
+            low = bits & -bits
+            members.append(low.bit_length() - 1)
+            bits ^= low
+        members.sort(key=self.position.__getitem__, reverse=True)
+
+        credits = self.snapshot.credits
+        for a in members:
+            critical[a] = credits[a] + max((critical[s] for s in self.snapshot.succ[a] if s != u), default=0)
+        del critical[u]
+        return critical
+
+    def analyze(self, u: int) -> Dict[str, Any]:
+        """
+        Returns:
+            Diccionario con la cota inferior y los semestres de random_schedule
+            sin el curso u, y su diferencia con el grafo completo
+        """
+        reduced = self.snapshot.without(u)
+        bounds = SemesterBounds(reduced).lower_bound(self.max_credits)
+        semesters = len(self._schedule._list_schedule(reduced, self.max_credits, self.critical_without(u)))
+        return {
+            "course_id": self.snapshot.ids[u],
+            "chain": bounds["chain"],
+            "lower_bound": bounds["lower_bound"],
+            "lower_bound_saved": self.base_lower_bound - bounds["lower_bound"],
+            "semesters": semesters,
+            "semesters_saved": self.base_semesters - semesters
+        }
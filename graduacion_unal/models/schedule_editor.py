@@ -0,0 +1,129 @@
+from typing import List, Dict, Any, Set, Tuple
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+from graduacion_unal.models.plan_state import PlanState
+
+
+class ScheduleEditor:
+    """
+    Plan de semestres editable con validación incremental.
+
+    Mantiene el plan en un PlanState (créditos por semestre, exceso y número de
+    aristas violadas) y, por curso, cuántos de sus prerrequisitos no están en
+    un semestre anterior. Mover un curso cuesta O(grado de entrada + grado de
+    salida) y el reporte incluye solo las violaciones que aparecen o se
+    resuelven con ese movimiento.
+
+    Atributos:
+        snapshot: Vista compacta del grafo.
+        state: Estado incremental del plan.
+        missing_prereqs: Prerrequisitos no cumplidos de cada índice de curso.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot, max_credits: int, schedule: Dict[int, List[int]]) -> None:
+        self.snapshot = snapshot
+        self.state = PlanState.from_schedule(snapshot, max_credits, schedule)
+        semester = self.state.semester
+        self.missing_prereqs: List[int] = [sum(1 for p in snapshot.pred[u] if semester[p] >= semester[u])
+                                           for u in range(len(snapshot))]
+
+    def _violated_edges(self, u: int) -> Set[Tuple[int, int]]:
+        """
+        Returns:
+            Aristas (prerrequisito, curso) incidentes a u que están violadas
+        """
+        semester = self.state.semester
+        k = semester[u]
+        edges = {(p, u) for p in self.snapshot.pred[u] if semester[p] >= k}
+        edges.update((u, s) for s in self.snapshot.succ[u] if k >= semester[s])
+        return edges
+
+    def _overloaded(self, k: int) -> bool:
+        return k < len(self.state.load) and self.state.load[k] > self.state.max_credits
+
+    def move(self, course_id: int, semester: int) -> Dict[str, Any]:
+        """
+        Mueve un curso a otro semestre y reporta el cambio de validez.
+
+        Args:
+            course_id: ID del curso a mover
+            semester: Semestre destino (1-based; puede ser uno nuevo al final)
+
+        Returns:
+            Diccionario con la validez del plan, las violaciones nuevas y las
+            resueltas, y los créditos de los semestres afectados
+
+        Raises:
+            ValueError: Si el curso no existe o el semestre no es positivo
+        """
+        u = self.snapshot.index.get(course_id)
+        if u is None:
+            raise ValueError(f"Curso {course_id} no encontrado en el grafo")
+        if semester < 1:
+            raise ValueError("El semestre destino debe ser mayor o igual a 1")
+
+        source = self.state.semester[u]
+        edges_before = self._violated_edges(u)
+        overloaded_before = {k: self._overloaded(k) for k in (source, semester)}
+
+        self.state.move(u, semester)
+
+        edges_after = self._violated_edges(u)
+        for p, v in edges_after - edges_before:
+            self.missing_prereqs[v] += 1
+        for p, v in edges_before - edges_after:
+            self.missing_prereqs[v] -= 1
+
+        new_violations = [self._edge_info(edge) for edge in edges_after - edges_before]
+        resolved_violations = [self._edge_info(edge) for edge in edges_before - edges_after]
+        for k, was_overloaded in overloaded_before.items():
+            is_overloaded = self._overloaded(k)
+            if is_overloaded and not was_overloaded:
+                new_violations.append(self._credits_info(k))
+            elif was_overloaded and not is_overloaded:
+                resolved_violations.append(self._credits_info(k))
+
+        return {
+            "valid": self.state.is_valid(),
+            "new_violations": new_violations,
+            "resolved_violations": resolved_violations,
+            "semester_credits": {k: self.state.load[k] for k in (source, semester)}
+        }
+
+    def _edge_info(self, edge: Tuple[int, int]) -> Dict[str, Any]:
+        p, v = edge
+        return {
+            "type": "prerequisite",
+            "course_id": self.snapshot.ids[v],
+            "prereq_id": self.snapshot.ids[p]
+        }
+
+    def _credits_info(self, k: int) -> Dict[str, Any]:
+        return {
+            "type": "credits",
+            "semester": k,
+            "credits": self.state.load[k]
+        }
+
+    def is_valid(self) -> bool:
+        return self.state.is_valid()
+
+    def course_status(self, course_id: int) -> Dict[str, Any]:
+        """
+        Returns:
+            Semestre del curso y número de prerrequisitos que aún no cumple
+        """
+        u = self.snapshot.index[course_id]
+        return {
+            "semester": self.state.semester[u],
+            "missing_prereqs": self.missing_prereqs[u]
+        }
+
+    def to_schedule(self) -> Dict[int, List[int]]:
+        """
+        Returns:
+            Plan actual semestre -> lista de IDs (sin semestres vacíos y sin
+            renumerar)
+        """
+        members = self.state.members
+        return {k: sorted(self.snapshot.ids[u] for u in members[k])
+                for k in range(1, self.state.last + 1) if members[k]}
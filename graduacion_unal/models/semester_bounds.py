@@ -0,0 +1,230 @@
+from typing import List, Dict, Any, Optional
+from graduacion_unal.models.graph_snapshot import GraphSnapshot
+
+_popcount = getattr(int, "bit_count", None) or (lambda bits: bin(bits).count("1"))
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+class SemesterBounds:
+    """
+    Motor de ventanas de semestre (ASAP/ALAP) sobre una vista del grafo.
+
+    Para cada curso calcula:
+    - earliest: primer semestre en que puede cursarse. Es el máximo entre su
+      profundidad de prerrequisitos y lo que exige el tope de créditos para
+      completar antes todos sus prerrequisitos transitivos.
+    - latest: último semestre en que puede cursarse sin retrasar un plan de
+      `target` semestres, por la cadena de dependientes que aún le siguen y
+      por los créditos de todos ellos.
+    - slack: latest - earliest. Los cursos con holgura 0 son críticos.
+
+    Las sumas de créditos de ancestros/descendientes se obtienen de los
+    bitsets de alcanzabilidad agrupando los cursos por valor de créditos, de
+    modo que cada suma es un puñado de popcounts sobre enteros de Python.
+
+    Atributos:
+        snapshot: Vista del grafo.
+        depth: Profundidad (1-based) de cada curso.
+        height: Longitud de la cadena más larga que empieza en cada curso.
+    """
+
+    def __init__(self, snapshot: GraphSnapshot) -> None:
+        snapshot.require_acyclic()
+        self.snapshot = snapshot
+        n = len(snapshot)
+
+        self.depth: List[int] = [1] * n
+        for u in snapshot.order:
+            for v in snapshot.succ[u]:
+                if self.depth[u] + 1 > self.depth[v]:
+                    self.depth[v] = self.depth[u] + 1
+
+        self.height: List[int] = [1] * n
+        for u in reversed(snapshot.order):
+            for v in snapshot.succ[u]:
+                if self.height[v] + 1 > self.height[u]:
+                    self.height[u] = self.height[v] + 1
+
+        self._ancestor_credits: Optional[List[int]] = None
+        self._descendant_credits: Optional[List[int]] = None
+
+    @staticmethod
+    def of(snapshot: GraphSnapshot) -> 'SemesterBounds':
+        """
+        Obtiene el motor asociado a una vista, calculándolo una sola vez.
+        """
+        return snapshot.memo('semester_bounds', SemesterBounds)
+
+    def _credit_sums(self, bitsets: List[int]) -> List[int]:
+        """
+        Suma los créditos de los cursos de cada bitset.
+        """
+        masks: Dict[int, int] = {}
+        for u, credits in enumerate(self.snapshot.credits):
+            if credits:
+                masks[credits] = masks.get(credits, 0) | (1 << u)
+        return [sum(credits * _popcount(bits & mask) for credits, mask in masks.items())
+                for bits in bitsets]
+
+    def ancestor_credits(self) -> List[int]:
+        """
+        Returns:
+            Créditos de todos los prerrequisitos transitivos de cada curso
+        """
+        if self._ancestor_credits is None:
+            self._ancestor_credits = self._credit_sums(self.snapshot.ancestors())
+        return self._ancestor_credits
+
+    def descendant_credits(self) -> List[int]:
+        """
+        Returns:
+            Créditos de todos los dependientes transitivos de cada curso
+        """
+        if self._descendant_credits is None:
+            self._descendant_credits = self._credit_sums(self.snapshot.descendants())
+        return self._descendant_credits
+
+    def dependent_counts(self) -> List[int]:
+        """
+        Returns:
+            Número de dependientes transitivos de cada curso
+        """
+        return [_popcount(bits) for bits in self.snapshot.descendants()]
+
+    def earliest(self, max_credits: int) -> List[int]:
+        """
+        Calcula el semestre más temprano (ASAP) de cada curso.
+
+        Args:
+            max_credits: Límite de créditos por semestre
+
+        Returns:
+            Lista de semestres (1-based) indexada por índice de curso
+        """
+        ancestors = self.ancestor_credits()
+        return [max(self.depth[u], _ceil_div(ancestors[u], max_credits) + 1)
+                for u in range(len(self.depth))]
+
+    def latest(self, max_credits: int, target: int) -> List[int]:
+        """
+        Calcula el semestre más tardío (ALAP) de cada curso para un plan de
+        `target` semestres.
+
+        Args:
+            max_credits: Límite de créditos por semestre
+            target: Número de semestres del plan
+
+        Returns:
+            Lista de semestres (1-based) indexada por índice de curso
+        """
+        descendants = self.descendant_credits()
+        return [target - max(self.height[u] - 1, _ceil_div(descendants[u], max_credits))
+                for u in range(len(self.height))]
+
+    def lower_bound(self, max_credits: int) -> Dict[str, int]:
+        """
+        Calcula en O(V) (sobre profundidades y alturas ya calculadas) una cota
+        inferior del número de semestres de cualquier plan válido, combinando:
+        - chain: la cadena de prerrequisitos más larga.
+        - credits: el volumen total de créditos dividido por el tope.
+        - levels: capacidad por niveles. Los cursos de profundidad >= d no pueden
+          cursarse antes del semestre d, así que T >= d - 1 + créditos(prof >= d) / tope;
+          simétricamente, los de altura >= h dejan h - 1 semestres detrás.
+
+        Args:
+            max_credits: Límite de créditos por semestre
+
+        Returns:
+            Diccionario con cada cota y la cota final ("lower_bound")
+
+        Raises:
+            ValueError: Si el límite de créditos no es positivo
+        """
+        if max_credits <= 0:
+            raise ValueError("El límite de créditos por semestre debe ser positivo")
+        credits = self.snapshot.credits
+        chain = max(self.height, default=0)
+
+        levels = 0
+        for per_course in (self.depth, self.height):
+            # Créditos por nivel y sumas acumuladas desde el nivel más alto
+            by_level = [0] * (chain + 2)
+            for u, level in enumerate(per_course):
+                by_level[level] += credits[u]
+            suffix = 0
+            for level in range(chain, 0, -1):
+                suffix += by_level[level]
+                if suffix:
+                    levels = max(levels, level - 1 + _ceil_div(suffix, max_credits))
+
+        volume = _ceil_div(sum(credits), max_credits)
+        return {
+            "chain": chain,
+            "credits": volume,
+            "levels": levels,
+            "lower_bound": max(chain, volume, levels)
+        }
+
+    def remaining_lower_bound(self, max_credits: int, done: List[int]) -> int:
+        """
+        Cota inferior del número de semestres para cursar los cursos que no
+        están en `done` (índices ya aprobados): la cadena de prerrequisitos
+        pendientes más larga y el volumen de créditos pendientes.
+
+        Raises:
+            ValueError: Si el límite de créditos no es positivo
+        """
+        if max_credits <= 0:
+            raise ValueError("El límite de créditos por semestre debe ser positivo")
+        snapshot = self.snapshot
+        approved = bytearray(len(snapshot))
+        for u in done:
+            approved[u] = 1
+
+        chain = [0] * len(snapshot)
+        longest = 0
+        total = 0
+        for u in snapshot.order:
+            if approved[u]:
+                continue
+            chain[u] = 1 + max((chain[p] for p in snapshot.pred[u]), default=0)
+            longest = max(longest, chain[u])
+            total += snapshot.credits[u]
+        return max(longest, _ceil_div(total, max_credits))
+
+    def windows(self, max_credits: int, target: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Calcula earliest, latest y slack de todos los cursos.
+
+        Args:
+            max_credits: Límite de créditos por semestre
+            target: Número de semestres del plan. Si no se especifica se usa el
+                menor valor que no deja holguras negativas: el máximo entre la
+                cota inferior (lower_bound) y, para cada curso, su semestre ASAP
+                más los semestres que exigen sus dependientes.
+
+        Returns:
+            Diccionario con listas "earliest", "latest" y "slack" indexadas por
+            índice de curso, y el "target" usado
+
+        Raises:
+            ValueError: Si el límite de créditos no es positivo
+        """
+        if max_credits <= 0:
+            raise ValueError("El límite de créditos por semestre debe ser positivo")
+        earliest = self.earliest(max_credits)
+        if target is None:
+            descendants = self.descendant_credits()
+            target = max((earliest[u] + max(self.height[u] - 1, _ceil_div(descendants[u], max_credits))
+                          for u in range(len(earliest))), default=0)
+            target = max(target, self.lower_bound(max_credits)["lower_bound"])
+        latest = self.latest(max_credits, target)
+        return {
+            "earliest": earliest,
+            "latest": latest,
+            "slack": [l - e for e, l in zip(earliest, latest)],
+            "target": target
+        }
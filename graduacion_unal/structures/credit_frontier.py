@@ -0,0 +1,65 @@
+from bisect import insort
+from typing import Dict, List, Optional, Tuple, Any
+from graduacion_unal.structures.heap import MaxHeap
+
+
+class CreditBucketFrontier:
+    """
+    Frontera de cursos disponibles agrupada por valor de créditos.
+
+    Cada elemento es una tupla (prioridad, créditos, id). Los elementos se
+    guardan en un MaxHeap por cada valor de créditos, de modo que obtener el
+    elemento de mayor prioridad que cabe en `room` créditos solo requiere mirar
+    la cima de los montículos con créditos <= room: O(#valores de créditos)
+    más un pop O(log A). Como los créditos son enteros pequeños (1 a 4 en la
+    práctica), llenar un semestre toca solo los cursos que se eligen.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[int, MaxHeap] = {}
+        self._credit_values: List[int] = []
+        self._size: int = 0
+
+    def push(self, item: Tuple[Any, int, int]) -> None:
+        """
+        Inserta un elemento (prioridad, créditos, id).
+        Time complexity: O(log A)
+        """
+        credits = item[1]
+        bucket = self._buckets.get(credits)
+        if bucket is None:
+            bucket = MaxHeap()
+            self._buckets[credits] = bucket
+            insort(self._credit_values, credits)
+        bucket.push(item)
+        self._size += 1
+
+    def pop_fitting(self, room: int) -> Optional[Tuple[Any, int, int]]:
+        """
+        Elimina y retorna el elemento de mayor prioridad con créditos <= room.
+
+        Returns:
+            El elemento, o None si ninguno cabe
+        """
+        best_bucket = None
+        best_item = None
+        for credits in self._credit_values:
+            if credits > room:
+                break
+            bucket = self._buckets[credits]
+            if bucket.is_empty():
+                continue
+            top = bucket.peek()
+            if best_item is None or top > best_item:
+                best_item = top
+                best_bucket = bucket
+        if best_bucket is None:
+            return None
+        self._size -= 1
+        return best_bucket.pop()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def is_empty(self) -> bool:
+        return self._size == 0
@@ -47,6 +47,12 @@ class MaxHeap:
             self._sift_down(0)
         return top
 
+    def peek(self):
+        """Retorna el elemento de máxima prioridad sin eliminarlo."""
+        if not self._data:
+            raise IndexError("peek from empty heap")
+        return self._data[0]
+
     def __len__(self) -> int:
         return len(self._data)
 
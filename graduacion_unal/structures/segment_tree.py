@@ -0,0 +1,176 @@
+from typing import List
+
+
+class CapacitySegmentTree:
+    """
+    Árbol de segmentos (máximo) sobre la capacidad restante de cada semestre.
+
+    Responde en O(log S) la consulta "primer semestre >= inicio con al menos
+    `need` créditos libres", que es la base de la colocación earliest-fit.
+    Los semestres se numeran desde 0 y el árbol crece (duplicando su tamaño)
+    cuando hace falta un semestre más allá de los actuales.
+
+    Attributes:
+        capacity: Créditos disponibles en un semestre vacío.
+        size: Número de semestres representados (potencia de 2).
+        tree: Arreglo del árbol; la hoja del semestre i está en size + i.
+    """
+
+    def __init__(self, capacity: int, size: int = 8) -> None:
+        self.capacity: int = capacity
+        self.size: int = 1
+        while self.size < size:
+            self.size *= 2
+        self.tree: List[int] = [capacity] * (2 * self.size)
+
+    @classmethod
+    def from_loads(cls, capacity: int, loads: List[int]) -> 'CapacitySegmentTree':
+        """
+        Construye el árbol en O(S) a partir de los créditos ya ocupados de
+        cada semestre. Un semestre sobrecargado queda con capacidad negativa.
+        """
+        tree = cls(capacity, len(loads) + 1)
+        for index, load in enumerate(loads):
+            tree.tree[tree.size + index] = capacity - load
+        for node in range(tree.size - 1, 0, -1):
+            tree.tree[node] = max(tree.tree[2 * node], tree.tree[2 * node + 1])
+        return tree
+
+    def _grow(self) -> None:
+        """
+        Duplica el número de semestres conservando las capacidades actuales.
+        """
+        leaves = self.tree[self.size:]
+        self.size *= 2
+        self.tree = [self.capacity] * (2 * self.size)
+        self.tree[self.size:self.size + len(leaves)] = leaves
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def remaining(self, index: int) -> int:
+        """
+        Returns:
+            Créditos libres del semestre index
+        """
+        if index >= self.size:
+            return self.capacity
+        return self.tree[self.size + index]
+
+    def reserve(self, index: int, amount: int) -> None:
+        """
+        Descuenta `amount` créditos del semestre index.
+        Time complexity: O(log S)
+
+        Raises:
+            ValueError: Si el semestre no tiene capacidad suficiente
+        """
+        while index >= self.size:
+            self._grow()
+        node = self.size + index
+        if self.tree[node] < amount:
+            raise ValueError(f"El semestre {index} no tiene {amount} créditos libres")
+        self.tree[node] -= amount
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def release(self, index: int, amount: int) -> None:
+        """
+        Devuelve `amount` créditos al semestre index.
+        Time complexity: O(log S)
+        """
+        node = self.size + index
+        self.tree[node] += amount
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def find_first(self, start: int, need: int) -> int:
+        """
+        Busca el primer semestre >= start con al menos `need` créditos libres.
+        Time complexity: O(log S)
+
+        Raises:
+            ValueError: Si need supera la capacidad de un semestre vacío
+        """
+        if need > self.capacity:
+            raise ValueError(f"Se requieren {need} créditos y el tope es {self.capacity}")
+        while True:
+            found = self._find(1, 0, self.size - 1, start, need)
+            if found != -1:
+                return found
+            if start >= self.size:
+                return start
+            self._grow()
+
+    def find_last(self, stop: int, need: int) -> int:
+        """
+        Busca el último semestre < stop con al menos `need` créditos libres.
+        Time complexity: O(log S)
+
+        Returns:
+            El índice del semestre, o -1 si no hay ninguno
+        """
+        if stop <= 0:
+            return -1
+        if stop > self.size:
+            # Los semestres más allá del árbol están vacíos
+            return stop - 1 if need <= self.capacity else -1
+        return self._find_last(1, 0, self.size - 1, stop - 1, need)
+
+    def _find_last(self, node: int, low: int, high: int, end: int, need: int) -> int:
+        if low > end or self.tree[node] < need:
+            return -1
+        if low == high:
+            return low
+        mid = (low + high) // 2
+        found = self._find_last(2 * node + 1, mid + 1, high, end, need)
+        if found != -1:
+            return found
+        return self._find_last(2 * node, low, mid, end, need)
+
+    def most_free(self, start: int, stop: int) -> int:
+        """
+        Busca, entre los semestres start .. stop - 1, el de más créditos libres
+        (el de menor carga). Ante empates retorna el primero.
+        Time complexity: O(log S)
+
+        Returns:
+            El índice del semestre, o -1 si el rango está vacío
+        """
+        stop = min(stop, self.size)
+        if start >= stop:
+            return -1
+        return self._most_free(1, 0, self.size - 1, start, stop - 1)[1]
+
+    def _most_free(self, node: int, low: int, high: int, start: int, end: int):
+        if start <= low and high <= end:
+            # Bajar por el hijo con el máximo hasta la hoja
+            while node < self.size:
+                node = 2 * node if self.tree[2 * node] >= self.tree[2 * node + 1] else 2 * node + 1
+            return self.tree[node], node - self.size
+        mid = (low + high) // 2
+        best = (None, -1)
+        if start <= mid:
+            best = self._most_free(2 * node, low, mid, start, end)
+        if end > mid:
+            right = self._most_free(2 * node + 1, mid + 1, high, start, end)
+            if best[0] is None or right[0] > best[0]:
+                best = right
+        return best
+
+    def _find(self, node: int, low: int, high: int, start: int, need: int) -> int:
+        if high < start or self.tree[node] < need:
+            return -1
+        if low == high:
+            return low
+        mid = (low + high) // 2
+        found = self._find(2 * node, low, mid, start, need)
+        if found != -1:
+            return found
+        return self._find(2 * node + 1, mid + 1, high, start, need)
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,36 @@
+import pytest
+
+from graduacion_unal.models.Courses import Course
+from graduacion_unal.models.courses_graph import CoursesGraph
+
+
+def build_graph(courses):
+    graph = CoursesGraph()
+    graph.build_from_courses(courses)
+    return graph
+
+
+@pytest.mark.parametrize("method", ["kahn", "dfs"])
+@pytest.mark.parametrize("order_key", [None, "credits"])
+def test_orden_respeta_prerrequisitos(method, order_key):
+    graph = build_graph([Course(1, [], "A", 2), Course(2, [1], "B", 4), Course(3, [], "C", 3),
+                         Course(4, [2, 3], "D", 1)])
+
+    order = list(graph.iter_topological(order_key, method))
+
+    assert sorted(order) == [1, 2, 3, 4]
+    position = {course_id: k for k, course_id in enumerate(order)}
+    for course_id in order:
+        assert all(position[p] < position[course_id] for p in graph.get_course(course_id).prereqs)
+
+
+@pytest.mark.parametrize("method", ["kahn", "dfs"])
+@pytest.mark.parametrize("order_key", [None, "credits"])
+def test_grafo_con_ciclos_lanza_error(method, order_key):
+    graph = build_graph([Course(1, [3], "A", 3), Course(2, [1], "B", 3), Course(3, [2], "C", 3),
+                         Course(4, [], "D", 3)])
+
+    with pytest.raises(ValueError):
+        graph.topological_order()
+    with pytest.raises(ValueError):
+        list(graph.iter_topological(order_key, method))
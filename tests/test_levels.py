@@ -0,0 +1,32 @@
+from graduacion_unal.models.Courses import Course
+from graduacion_unal.models.courses_graph import CoursesGraph
+from graduacion_unal.models.courses_schedule import Schedule
+
+
+def build_graph(courses):
+    graph = CoursesGraph()
+    graph.build_from_courses(courses)
+    return graph
+
+
+def test_niveles_ignoran_prerrequisitos_sin_arista():
+    graph = build_graph([Course(1, [], "A", 3), Course(3, [1], "C", 3)])
+    graph.add_node(Course(2, [1, 99], "B", 3))
+    graph.levels()
+    # 99 se añade después de 2: no hay arista 99 -> 2
+    graph.add_node(Course(99, [3], "Z", 3))
+    graph.remove_edge(1, 2)
+
+    assert graph.levels() == {1: 1, 3: 2, 99: 3, 2: 1}
+    assert Schedule().tree_of_availible_courses(18, graph) == {1: [1, 2], 2: [3], 3: [99]}
+
+
+def test_arbol_usa_niveles_del_grafo_tras_modificarlo():
+    graph = build_graph([Course(1, [], "A", 3), Course(2, [1], "B", 3), Course(3, [2], "C", 3)])
+    schedule = Schedule()
+    assert schedule.tree_of_availible_courses(18, graph) == {1: [1], 2: [2], 3: [3]}
+
+    graph.add_node(Course(4, [3], "D", 3))
+    graph.remove_edge(1, 2)
+
+    assert schedule.tree_of_availible_courses(18, graph) == {1: [1, 2], 2: [3], 3: [4]}
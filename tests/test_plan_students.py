@@ -0,0 +1,33 @@
+import pytest
+
+from graduacion_unal.api.schedule_service import ScheduleService
+from graduacion_unal.models.Courses import Course
+from graduacion_unal.models.courses_graph import CoursesGraph
+
+
+def build_service(courses):
+    graph = CoursesGraph()
+    graph.build_from_courses(courses)
+    service = ScheduleService()
+    service.set_graph(graph)
+    return service
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_error_de_un_grupo_no_detiene_el_lote(workers):
+    service = build_service([Course(1, [], "A", 3), Course(2, [1], "B", 3), Course(3, [], "C", 4)])
+    students = [
+        # Tope inválido con todo aprobado: el plan es vacío y falla al armar el resultado
+        {"completed_courses": [1, 2, 3], "current_courses": [], "max_credits_per_semester": 0},
+        {"completed_courses": [1], "current_courses": [], "max_credits_per_semester": -2},
+        {"completed_courses": [], "current_courses": [3], "max_credits_per_semester": 18},
+    ]
+
+    results = list(service.plan_students(students, workers=workers))
+
+    assert len(results) == 3
+    by_cap = {r["max_credits_per_semester"]: r for r in results if r["success"]}
+    assert list(by_cap) == [18]
+    assert by_cap[18]["schedule"].keys() == {1, 2}
+    errors = [r for r in results if not r["success"]]
+    assert [r["error"] for r in errors] == ["REMAINING_SCHEDULE_ERROR"] * 2
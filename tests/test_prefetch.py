@@ -0,0 +1,53 @@
+import random
+import threading
+
+from graduacion_unal.adapters.schedule_cache import ScheduleCache
+from graduacion_unal.api.schedule_service import ScheduleService
+from graduacion_unal.models.Courses import Course
+from graduacion_unal.models.courses_graph import CoursesGraph
+from graduacion_unal.models.courses_schedule import Schedule
+
+
+def build_graph(n, seed):
+    rng = random.Random(seed)
+    courses = []
+    for i in range(1, n + 1):
+        prereqs = [j for j in range(1, i) if rng.random() < 3 / i]
+        courses.append(Course(i, prereqs, f"Curso {i}", rng.randint(1, 4)))
+    graph = CoursesGraph()
+    graph.build_from_courses(courses)
+    return graph
+
+
+def test_prefetch_con_grafo_modificado_durante_el_calculo():
+    graph = build_graph(400, seed=7)
+    service = ScheduleService()
+    service.set_graph(graph)
+
+    errors = []
+    previous_hook = threading.excepthook
+    threading.excepthook = lambda args: errors.append(args.exc_value)
+    try:
+        caps = list(range(6, 41))
+        first = service.prefetch_schedules(caps)
+        # Editar el grafo mientras el hilo de fondo planifica
+        for i in range(401, 431):
+            graph.add_node(Course(i, [i - 1] if i > 401 else [3], f"Curso {i}", 3))
+            graph.add_vertex(i, 10 + i % 50)
+        graph.remove_node(5)
+        second = service.prefetch_schedules(caps)
+        first.join(timeout=60)
+        second.join(timeout=60)
+    finally:
+        threading.excepthook = previous_hook
+
+    assert not errors
+    assert second is not first
+    fingerprint = graph.snapshot().fingerprint()
+    for cap in caps:
+        # Los planes precalculados corresponden al grafo ya modificado
+        plan = service.cache.get(ScheduleCache.make_key(fingerprint, strategy="random", max_credits=cap))
+        assert plan == Schedule().random_schedule(cap, graph)
+        result = service.generate_random_schedule(cap)
+        assert result["success"]
+        assert {k: [c["id"] for c in v["courses"]] for k, v in result["schedule"].items()} == plan
@@ -0,0 +1,38 @@
+from graduacion_unal.models.Courses import Course
+from graduacion_unal.models.courses_graph import CoursesGraph
+from graduacion_unal.models.courses_schedule import Schedule
+
+
+def build_graph(courses):
+    graph = CoursesGraph()
+    graph.build_from_courses(courses)
+    return graph
+
+
+def test_prerequisito_fuera_del_grafo_invalida_el_plan():
+    graph = build_graph([Course(1, [], "A", 3)])
+    graph.add_node(Course(2, [1, 99], "B", 3))
+
+    result = Schedule().is_valid_schedule({1: [1], 2: [2]}, graph, 18)
+
+    assert not result["valid"]
+    assert result["errors"] == ["Curso 2 en semestre 2 requiere prerrequisito 99 que no ha sido completado"]
+
+
+def test_prerequisito_fuera_del_grafo_aprobado_antes_del_plan():
+    graph = build_graph([Course(1, [], "A", 3)])
+    graph.add_node(Course(2, [1, 99], "B", 3))
+
+    result = Schedule().is_valid_schedule({1: [1], 2: [2]}, graph, 18, completed_courses=[99])
+
+    assert result["valid"]
+
+
+def test_prerequisito_anadido_despues_del_curso():
+    graph = CoursesGraph()
+    graph.add_node(Course(2, [1], "B", 3))
+    graph.add_node(Course(1, [], "A", 3))
+
+    result = Schedule().is_valid_schedule({1: [2], 2: [1]}, graph, 18, fail_fast=True)
+
+    assert result["errors"] == ["Curso 2 en semestre 1 requiere prerrequisito 1 que no ha sido completado"]